@@ -1,10 +1,14 @@
 from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-                             QTextEdit, QPushButton, QLabel, QTableWidget,
-                             QTableWidgetItem, QGroupBox, QGridLayout, QMessageBox,
+                             QTextEdit, QPushButton, QLabel, QTableView,
+                             QGroupBox, QGridLayout, QMessageBox,
                              QSpinBox, QComboBox, QCheckBox, QTabWidget)
 from PyQt6.QtCore import Qt, QTimer
-from tomasulo.processor import TomasuloProcessor
+from tomasulo.api import SimulationConfig
+from tomasulo.checkpoint import CheckpointStore
+from tomasulo.profiler import PhaseProfiler
 from gui.instruction_window import InstructionStatusWindow
+from gui.models import SnapshotTableModel, ROB_STATE_COLORS
+from tomasulo.vector import VECTOR_REGISTERS
 
 class MainWindow(QMainWindow):
     def __init__(self, processor=None):
@@ -56,6 +60,24 @@ class MainWindow(QMainWindow):
         config_layout.addWidget(self.latency_div, 2, 1)
         config_layout.addWidget(QLabel("Latência LD/ST:"), 3, 0)
         config_layout.addWidget(self.latency_mem, 3, 1)
+
+        # Latências de ponto flutuante
+        self.latency_fp_add = QSpinBox()
+        self.latency_fp_add.setRange(1, 20)
+        self.latency_fp_add.setValue(2)
+        self.latency_fp_mul = QSpinBox()
+        self.latency_fp_mul.setRange(1, 20)
+        self.latency_fp_mul.setValue(4)
+        self.latency_fp_div = QSpinBox()
+        self.latency_fp_div.setRange(1, 40)
+        self.latency_fp_div.setValue(10)
+
+        config_layout.addWidget(QLabel("Latência ADD.D/SUB.D:"), 4, 0)
+        config_layout.addWidget(self.latency_fp_add, 4, 1)
+        config_layout.addWidget(QLabel("Latência MUL.D:"), 5, 0)
+        config_layout.addWidget(self.latency_fp_mul, 5, 1)
+        config_layout.addWidget(QLabel("Latência DIV.D:"), 6, 0)
+        config_layout.addWidget(self.latency_fp_div, 6, 1)
         
         # Configuração de buffers
         self.buffer_add = QSpinBox()
@@ -68,7 +90,7 @@ class MainWindow(QMainWindow):
         self.buffer_mem.setRange(1, 10)
         self.buffer_mem.setValue(2)
         self.buffer_rob = QSpinBox()
-        self.buffer_rob.setRange(4, 16)
+        self.buffer_rob.setRange(1, 4096)
         self.buffer_rob.setValue(8)
         
         config_layout.addWidget(QLabel("Buffers ADD/SUB:"), 0, 2)
@@ -79,11 +101,37 @@ class MainWindow(QMainWindow):
         config_layout.addWidget(self.buffer_mem, 2, 3)
         config_layout.addWidget(QLabel("Tamanho ROB:"), 3, 2)
         config_layout.addWidget(self.buffer_rob, 3, 3)
+
+        # Unidades de ponto flutuante
+        self.buffer_fp_add = QSpinBox()
+        self.buffer_fp_add.setRange(1, 10)
+        self.buffer_fp_add.setValue(2)
+        self.buffer_fp_mul = QSpinBox()
+        self.buffer_fp_mul.setRange(1, 10)
+        self.buffer_fp_mul.setValue(2)
+
+        config_layout.addWidget(QLabel("Buffers ADD.D/SUB.D:"), 4, 2)
+        config_layout.addWidget(self.buffer_fp_add, 4, 3)
+        config_layout.addWidget(QLabel("Buffers MUL.D/DIV.D:"), 5, 2)
+        config_layout.addWidget(self.buffer_fp_mul, 5, 3)
+
+        # Unidade vetorial
+        self.buffer_vector = QSpinBox()
+        self.buffer_vector.setRange(1, 4)
+        self.buffer_vector.setValue(1)
+        self.vector_lanes = QSpinBox()
+        self.vector_lanes.setRange(1, 64)
+        self.vector_lanes.setValue(4)
+
+        config_layout.addWidget(QLabel("Unidades Vetoriais:"), 6, 2)
+        config_layout.addWidget(self.buffer_vector, 6, 3)
+        config_layout.addWidget(QLabel("Lanes Vetoriais:"), 7, 2)
+        config_layout.addWidget(self.vector_lanes, 7, 3)
         
         # Especulação
         self.speculation_check = QCheckBox("Habilitar Especulação")
         self.speculation_check.setChecked(True)
-        config_layout.addWidget(self.speculation_check, 4, 0, 1, 2)
+        config_layout.addWidget(self.speculation_check, 7, 0, 1, 2)
         
         # Valores iniciais de memória
         self.mem_r1 = QSpinBox()
@@ -93,10 +141,10 @@ class MainWindow(QMainWindow):
         self.mem_r2.setRange(-1000, 1000)
         self.mem_r2.setValue(20)
         
-        config_layout.addWidget(QLabel("Mem[R1]:"), 5, 0)
-        config_layout.addWidget(self.mem_r1, 5, 1)
-        config_layout.addWidget(QLabel("Mem[R2]:"), 5, 2)
-        config_layout.addWidget(self.mem_r2, 5, 3)
+        config_layout.addWidget(QLabel("Mem[R1]:"), 8, 0)
+        config_layout.addWidget(self.mem_r1, 8, 1)
+        config_layout.addWidget(QLabel("Mem[R2]:"), 8, 2)
+        config_layout.addWidget(self.mem_r2, 8, 3)
         
         config_group.setLayout(config_layout)
         left_layout.addWidget(config_group)
@@ -157,8 +205,9 @@ class MainWindow(QMainWindow):
         # Registradores inteiros
         int_registers_group = QGroupBox("Registradores Inteiros (R0-R31)")
         int_registers_layout = QVBoxLayout()
-        self.int_registers_table = QTableWidget(32, 3)
-        self.int_registers_table.setHorizontalHeaderLabels(["Registrador", "Valor", "Status"])
+        self.int_registers_model = SnapshotTableModel(["Registrador", "Valor", "Status"], self)
+        self.int_registers_table = QTableView()
+        self.int_registers_table.setModel(self.int_registers_model)
         int_registers_layout.addWidget(self.int_registers_table)
         int_registers_group.setLayout(int_registers_layout)
         registers_tabs.addTab(int_registers_group, "Inteiros")
@@ -166,21 +215,33 @@ class MainWindow(QMainWindow):
         # Registradores ponto flutuante
         fp_registers_group = QGroupBox("Registradores Ponto Flutuante (F0-F31)")
         fp_registers_layout = QVBoxLayout()
-        self.fp_registers_table = QTableWidget(32, 3)
-        self.fp_registers_table.setHorizontalHeaderLabels(["Registrador", "Valor", "Status"])
+        self.fp_registers_model = SnapshotTableModel(["Registrador", "Valor", "Status"], self)
+        self.fp_registers_table = QTableView()
+        self.fp_registers_table.setModel(self.fp_registers_model)
         fp_registers_layout.addWidget(self.fp_registers_table)
         fp_registers_group.setLayout(fp_registers_layout)
         registers_tabs.addTab(fp_registers_group, "Ponto Flutuante")
+
+        # Registradores vetoriais
+        vector_registers_group = QGroupBox("Registradores Vetoriais (V0-V7, VL)")
+        vector_registers_layout = QVBoxLayout()
+        self.vector_registers_model = SnapshotTableModel(["Registrador", "Valor", "Status"], self)
+        self.vector_registers_table = QTableView()
+        self.vector_registers_table.setModel(self.vector_registers_model)
+        vector_registers_layout.addWidget(self.vector_registers_table)
+        vector_registers_group.setLayout(vector_registers_layout)
+        registers_tabs.addTab(vector_registers_group, "Vetoriais")
         
         right_layout.addWidget(registers_tabs)
 
         # Estações de Reserva
         stations_group = QGroupBox("Estações de Reserva")
         stations_layout = QVBoxLayout()
-        self.stations_table = QTableWidget(9, 8)  # Added remaining cycles column
-        self.stations_table.setHorizontalHeaderLabels(
-            ["Nome", "Ocupada", "Operação", "Vj", "Vk", "Qj", "Qk", "Ciclos"]
+        self.stations_model = SnapshotTableModel(
+            ["Nome", "Ocupada", "Operação", "Vj", "Vk", "Qj", "Qk", "Ciclos"], self
         )
+        self.stations_table = QTableView()
+        self.stations_table.setModel(self.stations_model)
         stations_layout.addWidget(self.stations_table)
         stations_group.setLayout(stations_layout)
         right_layout.addWidget(stations_group)
@@ -188,10 +249,11 @@ class MainWindow(QMainWindow):
         # Buffer de Reordenamento
         rob_group = QGroupBox("Buffer de Reordenamento")
         rob_layout = QVBoxLayout()
-        self.rob_table = QTableWidget(8, 6)  # Added state column
-        self.rob_table.setHorizontalHeaderLabels(
-            ["Instrução", "Estado", "Destino", "Valor", "Pronto", "Especulação"]
+        self.rob_model = SnapshotTableModel(
+            ["Instrução", "Estado", "Destino", "Valor", "Pronto", "Especulação"], self
         )
+        self.rob_table = QTableView()
+        self.rob_table.setModel(self.rob_model)
         rob_layout.addWidget(self.rob_table)
         rob_group.setLayout(rob_layout)
         right_layout.addWidget(rob_group)
@@ -204,34 +266,72 @@ class MainWindow(QMainWindow):
         self.run_btn.clicked.connect(self.run)
         self.reset_btn.clicked.connect(self.reset_processor)
 
+        # Desempenho do simulador no host, sempre visível na barra de status
+        self.profile_label = QLabel()
+        self.statusBar().addPermanentWidget(self.profile_label)
+        self.profiler = None
+
+        # Checkpoints para continuar a simulação após editar o programa
+        self.checkpoints = CheckpointStore()
+
         # Timer para execução contínua
         self.timer = QTimer()
         self.timer.timeout.connect(self.step)
 
+    def current_config(self) -> SimulationConfig:
+        """Configuração atual da interface"""
+        latencies = {
+            "ADD": self.latency_add.value(),
+            "SUB": self.latency_add.value(),
+            "MUL": self.latency_mul.value(),
+            "DIV": self.latency_div.value(),
+            "LD": self.latency_mem.value(),
+            "ST": self.latency_mem.value(),
+            "ADD.D": self.latency_fp_add.value(),
+            "SUB.D": self.latency_fp_add.value(),
+            "MUL.D": self.latency_fp_mul.value(),
+            "DIV.D": self.latency_fp_div.value(),
+            "L.D": self.latency_mem.value(),
+            "S.D": self.latency_mem.value(),
+            "VADD": self.latency_add.value(),
+            "VMUL": self.latency_mul.value(),
+            "VLD": self.latency_mem.value(),
+            "VST": self.latency_mem.value(),
+            "SETVL": self.latency_add.value()
+        }
+        return SimulationConfig(
+            latencies=latencies,
+            n_add=self.buffer_add.value(),
+            n_mul=self.buffer_mul.value(),
+            n_mem=self.buffer_mem.value(),
+            n_fp_add=self.buffer_fp_add.value(),
+            n_fp_mul=self.buffer_fp_mul.value(),
+            n_vector=self.buffer_vector.value(),
+            vector_lanes=self.vector_lanes.value(),
+            rob_size=self.buffer_rob.value(),
+            # Valores iniciais da memória definidos na interface
+            memory={0: self.mem_r1.value(), 4: self.mem_r2.value()}
+        )
+
+    def create_processor(self):
+        """Cria um processador com a configuração atual da interface"""
+        return self.current_config().build_processor()
+
+    def resume_program(self, program) -> str:
+        """Carrega o programa e continua do último checkpoint ainda válido.
+
+        Só as instruções buscadas determinam o estado, então após editar a
+        linha K a simulação volta ao último checkpoint anterior à busca de K.
+        Retorna o texto de status.
+        """
+        config = self.current_config()
+        self.processor = config.build_processor()
+        self.processor.load_program(program)
+        cycle = self.checkpoints.resume(self.processor, config)
+        return f" (retomado do ciclo {cycle})" if cycle else ""
+
     def load_program(self):
         try:
-            # Get configuration values
-            latencies = {
-                "ADD": self.latency_add.value(),
-                "SUB": self.latency_add.value(),
-                "MUL": self.latency_mul.value(),
-                "DIV": self.latency_div.value(),
-                "LD": self.latency_mem.value(),
-                "ST": self.latency_mem.value()
-            }
-            
-            # Create new processor with configuration
-            self.processor = TomasuloProcessor(
-                latencies=latencies,
-                n_add=self.buffer_add.value(),
-                n_mul=self.buffer_mul.value(),
-                n_mem=self.buffer_mem.value()
-            )
-            
-            # Set memory initial values
-            self.processor.memory[0] = self.mem_r1.value()
-            self.processor.memory[4] = self.mem_r2.value()
-            
             # Load program
             program = self.code_edit.toPlainText().strip().split('\n')
             program = [line.strip() for line in program if line.strip()]
@@ -240,15 +340,16 @@ class MainWindow(QMainWindow):
                 QMessageBox.warning(self, "Erro", "Por favor, insira um programa MIPS válido.")
                 return
                 
-            self.processor.load_program(program)
+            resumed = self.resume_program(program)
             self.update_ui()
-            self.status_label.setText("Status: Programa Carregado")
+            self.status_label.setText("Status: Programa Carregado" + resumed)
             
         except Exception as e:
             QMessageBox.critical(self, "Erro", f"Erro ao carregar programa:\n{str(e)}")
 
     def step(self):
         if self.processor.step():
+            self.checkpoints.record(self.processor)
             self.update_ui()
         else:
             self.timer.stop()
@@ -279,118 +380,76 @@ class MainWindow(QMainWindow):
                 self.instruction_window.close()
                 del self.instruction_window
                 
-            # Create new processor with current configuration
-            latencies = {
-                "ADD": self.latency_add.value(),
-                "SUB": self.latency_add.value(),
-                "MUL": self.latency_mul.value(),
-                "DIV": self.latency_div.value(),
-                "LD": self.latency_mem.value(),
-                "ST": self.latency_mem.value()
-            }
-            
-            self.processor = TomasuloProcessor(
-                latencies=latencies,
-                n_add=self.buffer_add.value(),
-                n_mul=self.buffer_mul.value(),
-                n_mem=self.buffer_mem.value()
-            )
-            
-            # Reset memory values
-            self.processor.memory[0] = self.mem_r1.value()
-            self.processor.memory[4] = self.mem_r2.value()
-            
             # Reload program if exists
             program = self.code_edit.toPlainText().strip().split('\n')
             program = [line.strip() for line in program if line.strip()]
             
+            resumed = ""
             if program:
-                self.processor.load_program(program)
+                resumed = self.resume_program(program)
+            else:
+                # Create new processor with current configuration
+                self.processor = self.create_processor()
             
             self.update_ui()
-            self.status_label.setText("Status: Pronto")
+            self.status_label.setText("Status: Pronto" + resumed)
             
         except Exception as e:
             QMessageBox.critical(self, "Erro", f"Erro ao resetar processador:\n{str(e)}")
 
     def update_ui(self):
-        state = self.processor.get_state()
-        
+        metrics = self.processor.get_metrics()
+
+        # Cada novo processador recebe seu próprio profiler
+        if self.profiler is None or self.profiler.processor is not self.processor:
+            self.profiler = PhaseProfiler(self.processor).attach()
+        self.profile_label.setText(self.profiler.summary())
+
         # Atualizar métricas
-        self.cycle_label.setText(f"Ciclo: {state['cycle']}")
-        self.ipc_label.setText(f"IPC: {state['metrics']['ipc']:.2f}")
-        self.bubbles_label.setText(f"Ciclos de Bolha: {state['metrics']['bubble_cycles']}")
-        self.committed_label.setText(f"Instruções Commitadas: {state['metrics']['committed_instructions']}/{state['metrics']['total_instructions']}")
-
-        # Atualizar registradores inteiros
-        self.int_registers_table.setRowCount(0)
-        for i in range(32):
-            reg = f"R{i}"
-            info = state['registers'].get(reg, {'value': 0, 'status': None})
-            row = self.int_registers_table.rowCount()
-            self.int_registers_table.insertRow(row)
-            self.int_registers_table.setItem(row, 0, QTableWidgetItem(reg))
-            self.int_registers_table.setItem(row, 1, QTableWidgetItem(str(info['value'])))
-            self.int_registers_table.setItem(row, 2, QTableWidgetItem(str(info['status'])))
-
-        # Atualizar registradores ponto flutuante
-        self.fp_registers_table.setRowCount(0)
-        for i in range(32):
-            reg = f"F{i}"
-            info = state['registers'].get(reg, {'value': 0, 'status': None})
-            row = self.fp_registers_table.rowCount()
-            self.fp_registers_table.insertRow(row)
-            self.fp_registers_table.setItem(row, 0, QTableWidgetItem(reg))
-            self.fp_registers_table.setItem(row, 1, QTableWidgetItem(str(info['value'])))
-            self.fp_registers_table.setItem(row, 2, QTableWidgetItem(str(info['status'])))
+        self.cycle_label.setText(f"Ciclo: {self.processor.cycle}")
+        self.ipc_label.setText(f"IPC: {metrics['ipc']:.2f}")
+        self.bubbles_label.setText(f"Ciclos de Bolha: {metrics['bubble_cycles']}")
+        self.committed_label.setText(f"Instruções Commitadas: {metrics['committed_instructions']}/{metrics['total_instructions']}")
+
+        # Os modelos comparam com a atualização anterior e só notificam o que mudou
+        values = self.processor.register_status.values
+        status = self.processor.register_status.status
+        self.int_registers_model.set_rows([
+            (f"R{i}", values[f"R{i}"], status[f"R{i}"]) for i in range(32)
+        ])
+        self.fp_registers_model.set_rows([
+            (f"F{i}", values[f"F{i}"], status[f"F{i}"]) for i in range(32)
+        ])
+        self.vector_registers_model.set_rows([
+            (reg, values[reg], status[reg]) for reg in [*VECTOR_REGISTERS, "VL"]
+        ])
 
         # Atualizar estações de reserva
-        self.stations_table.setRowCount(0)
-        for name, info in state['reservation_stations'].items():
-            row = self.stations_table.rowCount()
-            self.stations_table.insertRow(row)
-            self.stations_table.setItem(row, 0, QTableWidgetItem(name))
-            self.stations_table.setItem(row, 1, QTableWidgetItem(str(info['busy'])))
-            self.stations_table.setItem(row, 2, QTableWidgetItem(str(info['op'])))
-            self.stations_table.setItem(row, 3, QTableWidgetItem(str(info['vj'])))
-            self.stations_table.setItem(row, 4, QTableWidgetItem(str(info['vk'])))
-            self.stations_table.setItem(row, 5, QTableWidgetItem(str(info['qj'])))
-            self.stations_table.setItem(row, 6, QTableWidgetItem(str(info['qk'])))
-            self.stations_table.setItem(row, 7, QTableWidgetItem(str(info.get('remaining_cycles', ''))))
+        self.stations_model.set_rows([
+            (name, station.busy, station.op.value if station.op else None,
+             station.vj, station.vk, station.qj, station.qk, station.remaining_cycles)
+            for name, station in self.processor.reservation_stations.get_all_stations().items()
+        ])
 
         # Atualizar buffer de reordenamento
-        self.rob_table.setRowCount(0)
-        for entry in state['reorder_buffer']:
+        rob_rows = []
+        rob_colors = []
+        for entry in self.processor.reorder_buffer.get_all_entries():
             if entry is None:
                 continue
-                
-            row = self.rob_table.rowCount()
-            self.rob_table.insertRow(row)
-            self.rob_table.setItem(row, 0, QTableWidgetItem(str(entry['instruction'])))
-            self.rob_table.setItem(row, 1, QTableWidgetItem(str(entry['state'])))
-            self.rob_table.setItem(row, 2, QTableWidgetItem(str(entry['destination'])))
-            self.rob_table.setItem(row, 3, QTableWidgetItem(str(entry['value'])))
-            self.rob_table.setItem(row, 4, QTableWidgetItem(str(entry['ready'])))
-            
+            rob_rows.append((entry.instruction.macro_op, entry.state, entry.destination,
+                             entry.value, entry.ready, entry.speculative))
             # Highlight speculative entries
-            if entry.get('branch_mispredicted', False):
-                for col in range(5):
-                    self.rob_table.item(row, col).setBackground(Qt.GlobalColor.yellow)
-            elif entry['state'] == "ISSUE":
-                for col in range(5):
-                    self.rob_table.item(row, col).setBackground(Qt.GlobalColor.lightGray)
-            elif entry['state'] == "EXECUTE":
-                for col in range(5):
-                    self.rob_table.item(row, col).setBackground(Qt.GlobalColor.cyan)
-            elif entry['state'] == "WRITE_RESULT":
-                for col in range(5):
-                    self.rob_table.item(row, col).setBackground(Qt.GlobalColor.green)
-            elif entry['state'] == "COMMIT":
-                for col in range(5):
-                    self.rob_table.item(row, col).setBackground(Qt.GlobalColor.darkGreen)
-        
+            if entry.branch_mispredicted:
+                rob_colors.append(Qt.GlobalColor.yellow)
+            else:
+                rob_colors.append(ROB_STATE_COLORS.get(entry.state))
+        self.rob_model.set_rows(rob_rows, rob_colors)
+
         # Atualizar janela de status das instruções se estiver aberta
         if hasattr(self, 'instruction_window') and self.instruction_window.isVisible():
+            if self.instruction_window.processor is not self.processor:
+                self.instruction_window.set_processor(self.processor)
             self.instruction_window.update_status()
 
                     
@@ -0,0 +1,256 @@
+from typing import List, Optional, Sequence
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, QRect
+from PyQt6.QtGui import QColor, QPainter
+from PyQt6.QtWidgets import QAbstractScrollArea
+
+STAGES = ['issue', 'execute', 'write_result', 'commit']
+
+STAGE_COLORS = {
+    'issue': Qt.GlobalColor.lightGray,
+    'execute': Qt.GlobalColor.cyan,
+    'write_result': Qt.GlobalColor.green,
+    'commit': Qt.GlobalColor.darkGreen,
+}
+
+ROB_STATE_COLORS = {
+    'ISSUE': Qt.GlobalColor.lightGray,
+    'EXECUTE': Qt.GlobalColor.cyan,
+    'WRITE_RESULT': Qt.GlobalColor.green,
+    'COMMIT': Qt.GlobalColor.darkGreen,
+}
+
+
+def _changed_ranges(rows: Sequence[int]):
+    """Agrupa linhas alteradas em intervalos contíguos (início, fim)"""
+    start = end = None
+    for row in sorted(set(rows)):
+        if start is None:
+            start = end = row
+        elif row == end + 1:
+            end = row
+        else:
+            yield start, end
+            start = end = row
+    if start is not None:
+        yield start, end
+
+
+def _same_row(old: tuple, new: tuple) -> bool:
+    try:
+        return bool(old == new)
+    except ValueError:
+        # Registradores vetoriais são arrays NumPy, sem igualdade escalar
+        return len(old) == len(new) and all(a is b or str(a) == str(b) for a, b in zip(old, new))
+
+
+class SnapshotTableModel(QAbstractTableModel):
+    """Tabela pequena (registradores, estações, ROB) atualizada por comparação.
+
+    set_rows() recebe as linhas atuais e emite dataChanged apenas para os
+    intervalos que mudaram desde a última atualização.
+    """
+
+    def __init__(self, headers: List[str], parent=None):
+        super().__init__(parent)
+        self.headers = headers
+        self.rows: List[tuple] = []
+        self.colors: List[Optional[Qt.GlobalColor]] = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.headers[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            return str(self.rows[index.row()][index.column()])
+        if role == Qt.ItemDataRole.BackgroundRole:
+            color = self.colors[index.row()]
+            return QColor(color) if color is not None else None
+        return None
+
+    def set_rows(self, rows: List[tuple], colors: Optional[List[Optional[Qt.GlobalColor]]] = None):
+        colors = colors if colors is not None else [None] * len(rows)
+        old_count, new_count = len(self.rows), len(rows)
+        changed = [
+            row for row in range(min(old_count, new_count))
+            if not _same_row(self.rows[row], rows[row]) or self.colors[row] != colors[row]
+        ]
+
+        if new_count > old_count:
+            self.beginInsertRows(QModelIndex(), old_count, new_count - 1)
+            self.rows, self.colors = rows, colors
+            self.endInsertRows()
+        elif new_count < old_count:
+            self.beginRemoveRows(QModelIndex(), new_count, old_count - 1)
+            self.rows, self.colors = rows, colors
+            self.endRemoveRows()
+        else:
+            self.rows, self.colors = rows, colors
+
+        last_column = len(self.headers) - 1
+        for start, end in _changed_ranges(changed):
+            self.dataChanged.emit(self.index(start, 0), self.index(end, last_column))
+
+
+class InstructionStatusModel(QAbstractTableModel):
+    """Status das instruções lido diretamente de processor.instruction_status.
+
+    As células são consultadas sob demanda pela view (apenas as visíveis) e
+    refresh() usa processor.status_changes para notificar só as linhas que
+    mudaram desde a última atualização.
+    """
+
+    HEADERS = ["Instrução", "Issue", "Execute", "Write Result", "Commit"]
+
+    def __init__(self, processor, parent=None):
+        super().__init__(parent)
+        self.processor = processor
+        self._status = processor.instruction_status
+        self._cursor = 0
+
+    def set_processor(self, processor):
+        self.beginResetModel()
+        self.processor = processor
+        self._status = processor.instruction_status
+        self._cursor = 0
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._status)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        instr = self._status[index.row()]
+        column = index.column()
+        if column == 0:
+            return instr['instruction'] if role == Qt.ItemDataRole.DisplayRole else None
+
+        stage = STAGES[column - 1]
+        if not instr.get(stage):
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            return "X"
+        if role == Qt.ItemDataRole.BackgroundRole:
+            return QColor(STAGE_COLORS[stage])
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return Qt.AlignmentFlag.AlignCenter
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return f"Ciclo {instr.get(f'{stage}_cycle')}"
+        return None
+
+    def refresh(self):
+        """Notifica as linhas alteradas desde a última chamada"""
+        # O processador recarregou o programa: a lista de status foi trocada
+        if self.processor.instruction_status is not self._status:
+            self.set_processor(self.processor)
+            return
+        changes = self.processor.status_changes
+        if len(changes) < self._cursor:
+            self._cursor = 0
+        pending = changes[self._cursor:]
+        self._cursor = len(changes)
+        last_column = len(self.HEADERS) - 1
+        for start, end in _changed_ranges(pending):
+            self.dataChanged.emit(self.index(start, 0), self.index(end, last_column))
+
+
+class TimelineView(QAbstractScrollArea):
+    """Diagrama de Gantt dos estágios de cada instrução (linha) por ciclo (coluna).
+
+    Apenas as linhas e ciclos dentro da área visível são desenhados.
+    """
+
+    ROW_HEIGHT = 18
+    CYCLE_WIDTH = 14
+    LABEL_WIDTH = 160
+
+    def __init__(self, processor, parent=None):
+        super().__init__(parent)
+        self.processor = processor
+        self.verticalScrollBar().setSingleStep(self.ROW_HEIGHT)
+        self.horizontalScrollBar().setSingleStep(self.CYCLE_WIDTH)
+
+    def set_processor(self, processor):
+        self.processor = processor
+        self.refresh()
+
+    def refresh(self):
+        rows = len(self.processor.instruction_status)
+        cycles = self.processor.cycle + 1
+        viewport = self.viewport().size()
+        self.verticalScrollBar().setRange(0, max(0, rows * self.ROW_HEIGHT - viewport.height()))
+        self.verticalScrollBar().setPageStep(viewport.height())
+        self.horizontalScrollBar().setRange(
+            0, max(0, self.LABEL_WIDTH + cycles * self.CYCLE_WIDTH - viewport.width())
+        )
+        self.horizontalScrollBar().setPageStep(viewport.width())
+        self.viewport().update()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.refresh()
+
+    def paintEvent(self, event):
+        painter = QPainter(self.viewport())
+        status = self.processor.instruction_status
+        height = self.viewport().height()
+        width = self.viewport().width()
+        y_offset = self.verticalScrollBar().value()
+        x_offset = self.horizontalScrollBar().value()
+
+        first_row = y_offset // self.ROW_HEIGHT
+        last_row = min(len(status), (y_offset + height) // self.ROW_HEIGHT + 1)
+        first_cycle = max(1, x_offset // self.CYCLE_WIDTH)
+        last_cycle = (x_offset + width - self.LABEL_WIDTH) // self.CYCLE_WIDTH + 1
+        current_cycle = self.processor.cycle
+
+        for row in range(first_row, last_row):
+            instr = status[row]
+            y = row * self.ROW_HEIGHT - y_offset
+            # Segmentos: cada estágio vai do seu ciclo até o início do próximo
+            for i, stage in enumerate(STAGES):
+                start = instr.get(f'{stage}_cycle')
+                if start is None:
+                    continue
+                end = start
+                if stage != 'commit':
+                    following = [instr.get(f'{s}_cycle') for s in STAGES[i + 1:]]
+                    following = [c for c in following if c is not None]
+                    end = (min(following) - 1) if following else current_cycle
+                start, end = max(start, first_cycle), min(max(start, end), last_cycle)
+                if start > end:
+                    continue
+                x = self.LABEL_WIDTH + (start - 1) * self.CYCLE_WIDTH - x_offset
+                painter.fillRect(
+                    QRect(x, y + 2, (end - start + 1) * self.CYCLE_WIDTH, self.ROW_HEIGHT - 4),
+                    QColor(STAGE_COLORS[stage])
+                )
+
+        # Rótulos fixos à esquerda, desenhados por cima das barras
+        painter.fillRect(QRect(0, 0, self.LABEL_WIDTH, height), self.palette().base())
+        for row in range(first_row, last_row):
+            y = row * self.ROW_HEIGHT - y_offset
+            painter.drawText(
+                QRect(4, y, self.LABEL_WIDTH - 8, self.ROW_HEIGHT),
+                Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignLeft,
+                status[row]['instruction']
+            )
+        painter.end()
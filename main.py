@@ -11,14 +11,24 @@ def main():
         "MUL": 3,
         "DIV": 5,
         "LD": 2,
-        "ST": 2
+        "ST": 2,
+        "ADD.D": 2,
+        "SUB.D": 2,
+        "MUL.D": 4,
+        "DIV.D": 10,
+        "L.D": 2,
+        "S.D": 2
     }
     n_add = 2
     n_mul = 1
     n_mem = 2  # Agora controla tanto LD quanto ST
+    n_fp_add = 2
+    n_fp_mul = 2
+    rob_size = 8
 
     app = QApplication(sys.argv)
-    processor = TomasuloProcessor(latencies=latencies, n_add=n_add, n_mul=n_mul, n_mem=n_mem)
+    processor = TomasuloProcessor(latencies=latencies, n_add=n_add, n_mul=n_mul, n_mem=n_mem,
+                                  n_fp_add=n_fp_add, n_fp_mul=n_fp_mul, rob_size=rob_size)
     window = MainWindow(processor=processor)
     window.show()
     sys.exit(app.exec())
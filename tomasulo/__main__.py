@@ -0,0 +1,195 @@
+# __main__.py
+
+import argparse
+import json
+from typing import List
+from .api import SimulationConfig, compare_schedule, parse_program
+from .engines import ENGINES, compare_engines
+from .multicore import MultiCoreSystem
+from .profiler import PhaseProfiler
+from .service import serve
+from .tuner import STRATEGIES, tune
+
+
+def read_program(path: str) -> List[str]:
+    """Lê um programa MIPS ignorando linhas vazias e comentários (#)"""
+    with open(path) as f:
+        return parse_program(f.read())
+
+
+def run(args) -> dict:
+    config = SimulationConfig(
+        latencies=json.loads(args.latencies) if args.latencies else (),
+        n_add=args.n_add,
+        n_mul=args.n_mul,
+        n_mem=args.n_mem,
+        n_fp_add=args.n_fp_add,
+        n_fp_mul=args.n_fp_mul,
+        n_vector=args.n_vector,
+        vector_lanes=args.vector_lanes,
+        rob_size=args.rob_size,
+        reuse_capacity=args.reuse_capacity,
+        fusion=args.fusion.split(",") if args.fusion else (),
+        static_schedule=args.schedule,
+        rename_registers=args.rename_registers,
+        max_cycles=args.max_cycles
+    )
+    # O perfil precisa do processador, então o laço de simulate() é repetido aqui
+    processor = config.build_processor()
+    processor.load_program(read_program(args.program))
+    profiler = PhaseProfiler(processor, sample_every=args.profile).attach() if args.profile else None
+    while processor.cycle < config.max_cycles and processor.step():
+        pass
+    metrics = processor.get_metrics()
+    if profiler is not None:
+        metrics["profile"] = profiler.report()
+    return metrics
+
+
+def run_multicore(args) -> dict:
+    latencies = json.loads(args.latencies) if args.latencies else None
+    system = MultiCoreSystem(
+        n_cores=len(args.programs),
+        latencies=latencies,
+        memory_latency=args.memory_latency,
+        interconnect_latency=args.interconnect_latency
+    )
+    system.load_programs([read_program(path) for path in args.programs])
+    system.run(args.max_cycles)
+    return system.get_metrics()
+
+
+def compare(args) -> dict:
+    latencies = json.loads(args.latencies) if args.latencies else None
+    comparison = compare_engines(
+        read_program(args.program),
+        latencies=latencies,
+        n_add=args.n_add,
+        n_mul=args.n_mul,
+        n_mem=args.n_mem,
+        n_fp_add=args.n_fp_add,
+        n_fp_mul=args.n_fp_mul,
+        rob_size=args.rob_size,
+        baseline=args.baseline,
+        max_cycles=args.max_cycles
+    )
+    return comparison.report()
+
+
+def run_schedule(args) -> dict:
+    config = SimulationConfig(
+        latencies=json.loads(args.latencies) if args.latencies else (),
+        n_add=args.n_add,
+        n_mul=args.n_mul,
+        n_mem=args.n_mem,
+        n_fp_add=args.n_fp_add,
+        n_fp_mul=args.n_fp_mul,
+        rob_size=args.rob_size,
+        max_cycles=args.max_cycles
+    )
+    return compare_schedule(read_program(args.program), config, rename=args.rename_registers).as_dict()
+
+
+def run_tuner(args) -> dict:
+    base = SimulationConfig(
+        latencies=json.loads(args.latencies) if args.latencies else (),
+        max_cycles=args.max_cycles
+    )
+    options = {"candidates": args.candidates} if args.strategy == "halving" else {}
+    result = tune(
+        [read_program(path) for path in args.programs],
+        args.target_ipc,
+        costs=json.loads(args.costs) if args.costs else None,
+        base=base,
+        strategy=args.strategy,
+        **options
+    )
+    return result.as_dict()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m tomasulo", description="Simulador do algoritmo de Tomasulo")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Simula um programa e imprime as métricas")
+    run_parser.add_argument("program", help="Arquivo com o programa MIPS")
+    run_parser.add_argument("--latencies", help='Latências em JSON, ex.: \'{"MUL": 3, "DIV": 5}\'')
+    run_parser.add_argument("--n-add", type=int, default=3, help="Estações ADD/SUB")
+    run_parser.add_argument("--n-mul", type=int, default=3, help="Estações MUL/DIV")
+    run_parser.add_argument("--n-mem", type=int, default=2, help="Estações LD/ST")
+    run_parser.add_argument("--n-fp-add", type=int, default=2, help="Estações ADD.D/SUB.D")
+    run_parser.add_argument("--n-fp-mul", type=int, default=2, help="Estações MUL.D/DIV.D")
+    run_parser.add_argument("--n-vector", type=int, default=1, help="Unidades vetoriais")
+    run_parser.add_argument("--vector-lanes", type=int, default=4, help="Elementos por ciclo em cada unidade vetorial")
+    run_parser.add_argument("--rob-size", type=int, default=8, help="Entradas do buffer de reordenamento")
+    run_parser.add_argument("--reuse-capacity", type=int, default=0,
+                            help="Entradas do buffer de reuso de MUL/DIV (0 desativa)")
+    run_parser.add_argument("--fusion", help="Regras de fusão separadas por vírgula, ex.: load_add,load_mul")
+    run_parser.add_argument("--schedule", action="store_true", help="Escalona estaticamente os blocos básicos")
+    run_parser.add_argument("--rename-registers", action="store_true",
+                            help="Renomeia registradores para quebrar dependências falsas (com --schedule)")
+    run_parser.add_argument("--max-cycles", type=int, default=1_000_000, help="Limite de ciclos simulados")
+    run_parser.add_argument("--profile", type=int, default=0, metavar="N",
+                            help="Mede o tempo de host das fases a cada N ciclos (0 desativa)")
+
+    multicore_parser = subparsers.add_parser("multicore", help="Simula um programa por núcleo com memória coerente")
+    multicore_parser.add_argument("programs", nargs="+", help="Arquivos MIPS, um por núcleo")
+    multicore_parser.add_argument("--latencies", help="Latências em JSON")
+    multicore_parser.add_argument("--memory-latency", type=int, default=20, help="Latência da memória compartilhada")
+    multicore_parser.add_argument("--interconnect-latency", type=int, default=4, help="Ciclos por transação no barramento")
+    multicore_parser.add_argument("--max-cycles", type=int, default=1_000_000, help="Limite de ciclos globais")
+
+    compare_parser = subparsers.add_parser("compare", help="Compara os motores em ordem, placar e Tomasulo")
+    compare_parser.add_argument("program", help="Arquivo com o programa MIPS")
+    compare_parser.add_argument("--latencies", help="Latências em JSON")
+    compare_parser.add_argument("--n-add", type=int, default=3, help="Estações/unidades ADD/SUB")
+    compare_parser.add_argument("--n-mul", type=int, default=3, help="Estações/unidades MUL/DIV")
+    compare_parser.add_argument("--n-mem", type=int, default=2, help="Estações/unidades LD/ST")
+    compare_parser.add_argument("--n-fp-add", type=int, default=2, help="Estações/unidades ADD.D/SUB.D")
+    compare_parser.add_argument("--n-fp-mul", type=int, default=2, help="Estações/unidades MUL.D/DIV.D")
+    compare_parser.add_argument("--rob-size", type=int, default=8, help="Entradas do ROB (Tomasulo)")
+    compare_parser.add_argument("--baseline", choices=sorted(ENGINES), default="inorder", help="Referência do speedup")
+    compare_parser.add_argument("--max-cycles", type=int, default=1_000_000, help="Limite de ciclos por motor")
+
+    schedule_parser = subparsers.add_parser("schedule", help="Compara o programa original e o escalonado")
+    schedule_parser.add_argument("program", help="Arquivo com o programa MIPS")
+    schedule_parser.add_argument("--latencies", help="Latências em JSON")
+    schedule_parser.add_argument("--n-add", type=int, default=3, help="Estações ADD/SUB")
+    schedule_parser.add_argument("--n-mul", type=int, default=3, help="Estações MUL/DIV")
+    schedule_parser.add_argument("--n-mem", type=int, default=2, help="Estações LD/ST")
+    schedule_parser.add_argument("--n-fp-add", type=int, default=2, help="Estações ADD.D/SUB.D")
+    schedule_parser.add_argument("--n-fp-mul", type=int, default=2, help="Estações MUL.D/DIV.D")
+    schedule_parser.add_argument("--rob-size", type=int, default=8, help="Entradas do buffer de reordenamento")
+    schedule_parser.add_argument("--rename-registers", action="store_true", help="Renomeia registradores nos blocos")
+    schedule_parser.add_argument("--max-cycles", type=int, default=1_000_000, help="Limite de ciclos simulados")
+
+    tune_parser = subparsers.add_parser("tune", help="Procura a configuração mais barata que atinge um IPC")
+    tune_parser.add_argument("programs", nargs="+", help="Arquivos MIPS da carga de trabalho")
+    tune_parser.add_argument("--target-ipc", type=float, required=True, help="IPC agregado desejado")
+    tune_parser.add_argument("--strategy", choices=STRATEGIES, default="halving", help="Estratégia de busca")
+    tune_parser.add_argument("--costs", help='Custo por unidade de recurso em JSON, ex.: \'{"n_mul": 4, "rob_size": 0.5}\'')
+    tune_parser.add_argument("--candidates", type=int, default=64, help="Configurações sorteadas (halving)")
+    tune_parser.add_argument("--latencies", help="Latências em JSON")
+    tune_parser.add_argument("--max-cycles", type=int, default=1_000_000, help="Limite de ciclos por simulação")
+
+    serve_parser = subparsers.add_parser("serve", help="Inicia o serviço local de simulação")
+    serve_parser.add_argument("--socket", default="/tmp/tomasulo.sock", help="Caminho do socket Unix")
+    serve_parser.add_argument("--workers", type=int, default=None, help="Número de processos do pool")
+
+    args = parser.parse_args(argv)
+    if args.command == "run":
+        print(json.dumps(run(args), indent=2))
+    elif args.command == "multicore":
+        print(json.dumps(run_multicore(args), indent=2))
+    elif args.command == "compare":
+        print(json.dumps(compare(args), indent=2))
+    elif args.command == "schedule":
+        print(json.dumps(run_schedule(args), indent=2))
+    elif args.command == "tune":
+        print(json.dumps(run_tuner(args), indent=2))
+    elif args.command == "serve":
+        serve(args.socket, workers=args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+# analysis.py
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from .instructions import Instruction, InstructionType, InstructionFactory, LOAD_TYPES, STORE_TYPES
+
+# Classe de estação de reserva usada por cada tipo de instrução
+STATION_CLASS = {
+    InstructionType.ADD: "add",
+    InstructionType.SUB: "add",
+    InstructionType.MUL: "mul",
+    InstructionType.DIV: "mul",
+    InstructionType.LD: "mem",
+    InstructionType.ST: "mem",
+    InstructionType.L_D: "mem",
+    InstructionType.S_D: "mem",
+    InstructionType.ADD_D: "fp_add",
+    InstructionType.SUB_D: "fp_add",
+    InstructionType.MUL_D: "fp_mul",
+    InstructionType.DIV_D: "fp_mul",
+    InstructionType.SETVL: "add",
+    InstructionType.VLD: "vector",
+    InstructionType.VST: "vector",
+    InstructionType.VADD: "vector",
+    InstructionType.VMUL: "vector",
+}
+
+CONTROL_TYPES = (InstructionType.BEQ, InstructionType.BNE, InstructionType.J)
+
+
+@dataclass
+class DataflowBound:
+    """Limite inferior analítico de ciclos para um programa decodificado"""
+    instructions: int
+    critical_path_cycles: int
+    resource_cycles: Dict[str, int] = field(default_factory=dict)
+    has_branches: bool = False
+
+    @property
+    def lower_bound_cycles(self) -> int:
+        return max([self.critical_path_cycles, *self.resource_cycles.values()])
+
+    @property
+    def ipc_upper_bound(self) -> float:
+        cycles = self.lower_bound_cycles
+        return self.instructions / cycles if cycles > 0 else 0
+
+    @property
+    def bottleneck(self) -> str:
+        """Nome do limite dominante ('dataflow' ou a classe de recurso)"""
+        name, cycles = "dataflow", self.critical_path_cycles
+        for resource, value in self.resource_cycles.items():
+            if value > cycles:
+                name, cycles = resource, value
+        return name
+
+    def efficiency(self, total_cycles: int) -> float:
+        """Razão entre o limite de fluxo de dados e os ciclos simulados"""
+        return self.lower_bound_cycles / total_cycles if total_cycles > 0 else 0
+
+    def can_beat(self, best_cycles: int) -> bool:
+        """Indica se a configuração ainda pode superar o melhor resultado conhecido.
+
+        Com desvios o caminho executado não é conhecido estaticamente, então
+        o limite não é garantido e a configuração nunca é descartada.
+        """
+        if self.has_branches:
+            return True
+        return self.lower_bound_cycles < best_cycles
+
+
+def _sources(instruction: Instruction) -> List[str]:
+    """Registradores cuja produção a instrução espera nas estações de reserva"""
+    if instruction.fused is not None:
+        # Macro-op: só o operando da segunda instrução que não vem da carga
+        tail = instruction.fused
+        return [reg for reg in (tail.src1, tail.src2) if reg and reg != instruction.dest]
+    if instruction.type in LOAD_TYPES:
+        # O endereço é calculado na emissão; a espera pela base (que segura a
+        # emissão) é ignorada, o que só deixa o limite mais otimista
+        return []
+    if instruction.type in STORE_TYPES:
+        return [instruction.dest] if instruction.dest else []
+    return [reg for reg in (instruction.src1, instruction.src2) if reg]
+
+
+def analyze(instructions: List[Instruction], n_add: int = 3, n_mul: int = 3,
+            n_mem: int = 2, rob_size: int = 8,
+            latency_overrides: Optional[Dict[InstructionType, int]] = None,
+            n_fp_add: int = 2, n_fp_mul: int = 2, n_vector: int = 1) -> DataflowBound:
+    """Calcula, em tempo linear, o limite de ciclos imposto pelas dependências
+    de registradores e pela quantidade de estações e entradas do ROB.
+
+    O modelo segue o pipeline do TomasuloProcessor: uma emissão por ciclo,
+    latência + 1 ciclos em uma estação, resultado disponível para dependentes
+    no mesmo ciclo em que é propagado e commit em ordem, um por ciclo, no
+    ciclo seguinte ao término. latency_overrides substitui a latência de
+    tipos cuja execução pode ser mais curta que a da tabela (acerto na L1,
+    reuso de resultado), mantendo o limite válido. Uma macro-op (ver
+    fusion.py) ocupa uma emissão, uma estação e uma entrada do ROB pela
+    soma das latências do par. Instruções vetoriais entram com a latência
+    da tabela, o mínimo de tempo que ocupam a unidade vetorial.
+    """
+    latency_overrides = latency_overrides or {}
+    stations = {"add": n_add, "mul": n_mul, "mem": n_mem, "fp_add": n_fp_add, "fp_mul": n_fp_mul,
+                "vector": n_vector}
+    station_work = {name: 0 for name in stations}
+    rob_work = 0
+    ready_at: Dict[str, int] = {}  # Ciclo em que o último produtor de cada registrador termina
+    last_commit = 0
+    last_cycle = 0
+    has_branches = False
+
+    issue_cycle = 0
+    fused_tail = None
+    for instruction in instructions:
+        if instruction is fused_tail:
+            continue
+        issue_cycle += 1
+        if instruction.type in CONTROL_TYPES:
+            # Desvios são resolvidos na emissão, sem estação nem ROB
+            has_branches = True
+            last_cycle = max(last_cycle, issue_cycle)
+            continue
+
+        latency = latency_overrides.get(instruction.type, instruction.latency)
+        dest = instruction.dest
+        fused_tail = instruction.fused
+        if fused_tail is not None:
+            latency += latency_overrides.get(fused_tail.type, fused_tail.latency)
+            dest = fused_tail.dest
+        finish = issue_cycle + latency + 1
+        for reg in _sources(instruction):
+            if reg in ready_at:
+                finish = max(finish, ready_at[reg] + latency)
+        if dest and instruction.type not in STORE_TYPES:
+            ready_at[dest] = finish
+
+        last_commit = max(finish + 1, last_commit + 1)
+        last_cycle = max(last_cycle, last_commit)
+
+        station_class = STATION_CLASS.get(instruction.type)
+        if station_class is not None:
+            station_work[station_class] += latency + 1
+        rob_work += latency + 2
+
+    resource_cycles: Dict[str, int] = {}
+    for name, count in stations.items():
+        if station_work[name] and count > 0:
+            resource_cycles[name] = -(-station_work[name] // count) + 2
+    if rob_work and rob_size > 0:
+        resource_cycles["rob"] = -(-rob_work // rob_size) + 1
+
+    return DataflowBound(
+        instructions=len(instructions),
+        critical_path_cycles=last_cycle,
+        resource_cycles=resource_cycles,
+        has_branches=has_branches
+    )
+
+
+def estimate(program: List[str], latencies: Optional[dict] = None, n_add: int = 3,
+             n_mul: int = 3, n_mem: int = 2, rob_size: int = 8, n_fp_add: int = 2,
+             n_fp_mul: int = 2, n_vector: int = 1) -> DataflowBound:
+    """Decodifica o programa e calcula o limite sem simulá-lo"""
+    instructions = [InstructionFactory.create_instruction(instr, latencies) for instr in program]
+    return analyze(instructions, n_add=n_add, n_mul=n_mul, n_mem=n_mem, rob_size=rob_size,
+                   n_fp_add=n_fp_add, n_fp_mul=n_fp_mul, n_vector=n_vector)
@@ -0,0 +1,175 @@
+# api.py
+
+from dataclasses import dataclass, field, fields, replace
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple, Union
+from .cache import CacheConfig, MemoryHierarchy
+from .prefetch import PREFETCHERS, create_prefetcher
+from .processor import DEFAULT_MEMORY, TomasuloProcessor
+from .reuse_buffer import ReuseBuffer
+from .scheduler import ScheduleReport
+
+DEFAULT_MAX_CYCLES = 1_000_000
+
+
+def _frozen_items(mapping) -> Tuple[Tuple, ...]:
+    """Dicionário (ou pares) como tupla ordenada de pares, para ser hashable"""
+    items = mapping.items() if isinstance(mapping, Mapping) else mapping
+    return tuple(sorted(items))
+
+
+@dataclass(frozen=True)
+class SimulationConfig:
+    """Configuração imutável e hashable de uma simulação.
+
+    `latencies` e `memory` aceitam dicionários, guardados como tuplas de
+    pares ordenadas; `memory` é a memória inicial completa. A hierarquia de
+    cache só é usada quando `l1` é informada.
+    """
+    latencies: Tuple[Tuple[str, int], ...] = ()
+    n_add: int = 3
+    n_mul: int = 3
+    n_mem: int = 2
+    n_fp_add: int = 2
+    n_fp_mul: int = 2
+    n_vector: int = 1
+    vector_lanes: int = 4
+    rob_size: int = 8
+    reuse_capacity: int = 0  # 0 desativa o buffer de reuso
+    fusion: Tuple[str, ...] = ()
+    memory: Tuple[Tuple[int, int], ...] = tuple(sorted(DEFAULT_MEMORY.items()))
+    l1: Optional[CacheConfig] = None
+    l2: Optional[CacheConfig] = None
+    memory_latency: int = 20
+    mshrs: int = 4
+    prefetcher: Optional[str] = None
+    static_schedule: bool = False
+    rename_registers: bool = False
+    max_cycles: int = DEFAULT_MAX_CYCLES
+
+    def __post_init__(self):
+        object.__setattr__(self, "latencies", _frozen_items(self.latencies))
+        object.__setattr__(self, "memory", _frozen_items(self.memory))
+        object.__setattr__(self, "fusion", tuple(self.fusion or ()))
+        if self.prefetcher is not None and self.prefetcher not in PREFETCHERS:
+            raise ValueError(f"Prefetcher desconhecido: {self.prefetcher}")
+
+    @classmethod
+    def from_dict(cls, config: Mapping) -> "SimulationConfig":
+        """Configuração a partir de um dicionário JSON (chaves desconhecidas são erro).
+
+        As chaves de `memory` (podem ser strings) sobrescrevem a memória
+        inicial padrão, como no serviço de simulação.
+        """
+        names = {f.name for f in fields(cls)}
+        unknown = set(config) - names
+        if unknown:
+            raise ValueError(f"Opções desconhecidas: {sorted(unknown)}")
+        options = dict(config)
+        if "memory" in options:
+            options["memory"] = {**DEFAULT_MEMORY,
+                                 **{int(address): value for address, value in options["memory"].items()}}
+        for level in ("l1", "l2"):
+            if isinstance(options.get(level), Mapping):
+                options[level] = CacheConfig(**options[level])
+        if options.get("latencies") is None:
+            options.pop("latencies", None)
+        return cls(**options)
+
+    def build_processor(self) -> TomasuloProcessor:
+        """Novo processador com todos os componentes criados para ele"""
+        hierarchy = None
+        if self.l1 is not None:
+            hierarchy = MemoryHierarchy(self.l1, self.l2, self.memory_latency, self.mshrs,
+                                        prefetcher=create_prefetcher(self.prefetcher))
+        return TomasuloProcessor(
+            latencies=dict(self.latencies),
+            n_add=self.n_add,
+            n_mul=self.n_mul,
+            n_mem=self.n_mem,
+            n_fp_add=self.n_fp_add,
+            n_fp_mul=self.n_fp_mul,
+            n_vector=self.n_vector,
+            vector_lanes=self.vector_lanes,
+            rob_size=self.rob_size,
+            memory_hierarchy=hierarchy,
+            reuse_buffer=ReuseBuffer(self.reuse_capacity) if self.reuse_capacity else None,
+            fusion=self.fusion,
+            initial_memory=dict(self.memory),
+            static_schedule=self.static_schedule,
+            rename_registers=self.rename_registers
+        )
+
+
+@dataclass(frozen=True)
+class SimulationResult:
+    """Estado final e métricas de uma simulação"""
+    config: SimulationConfig
+    metrics: Dict = field(hash=False)
+    finished: bool
+    registers: Dict = field(hash=False)
+    memory: Dict[int, int] = field(hash=False)
+
+    @property
+    def cycles(self) -> int:
+        return self.metrics["total_cycles"]
+
+    @property
+    def ipc(self) -> float:
+        return self.metrics["ipc"]
+
+    def as_dict(self) -> Dict:
+        """Resultado serializável em JSON"""
+        return {
+            "metrics": self.metrics,
+            "finished": self.finished,
+            # Registradores vetoriais (arrays NumPy) viram listas
+            "registers": {reg: value.tolist() if hasattr(value, "tolist") else value
+                          for reg, value in self.registers.items()},
+            "memory": {str(address): value for address, value in self.memory.items()}
+        }
+
+
+def parse_program(program: Union[str, Sequence[str]]) -> List[str]:
+    """Linhas do programa, sem linhas vazias nem comentários (#)"""
+    if isinstance(program, str):
+        program = program.split("\n")
+    lines = [line.split('#', 1)[0].strip() for line in program]
+    return [line for line in lines if line]
+
+
+def simulate(program: Union[str, Sequence[str]], config: SimulationConfig = SimulationConfig()) -> SimulationResult:
+    """Simula o programa até o fim (ou `config.max_cycles`).
+
+    Reentrante: cada chamada decodifica o programa e cria processador,
+    caches, prefetcher e buffer de reuso próprios, e nenhum estado de
+    módulo é alterado durante a simulação. Chamadas simultâneas em threads
+    diferentes (por exemplo, em um ThreadPoolExecutor, inclusive no CPython
+    sem GIL) são independentes. Um mesmo TomasuloProcessor, por outro lado,
+    não deve ser usado por mais de uma thread ao mesmo tempo.
+    """
+    processor = config.build_processor()
+    processor.load_program(parse_program(program))
+    while processor.cycle < config.max_cycles and processor.step():
+        pass
+    return SimulationResult(
+        config=config,
+        metrics=processor.get_metrics(),
+        finished=processor.is_finished,
+        registers={reg: info["value"] for reg, info in processor.register_status.get_all_registers().items()},
+        memory=dict(processor.memory)
+    )
+
+
+def compare_schedule(program: Union[str, Sequence[str]], config: SimulationConfig = SimulationConfig(),
+                     rename: bool = False) -> ScheduleReport:
+    """Simula o programa original e o escalonado estaticamente com a mesma configuração.
+
+    A diferença nos ciclos de bolha é a parte das paradas recuperável em
+    software; o restante exige mais hardware.
+    """
+    before = simulate(program, replace(config, static_schedule=False, rename_registers=False))
+    processor = replace(config, static_schedule=True, rename_registers=rename).build_processor()
+    processor.load_program(parse_program(program))
+    while processor.cycle < config.max_cycles and processor.step():
+        pass
+    return ScheduleReport(before=before.metrics, after=processor.get_metrics(), schedule=processor.schedule_result)
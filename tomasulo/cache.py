@@ -0,0 +1,246 @@
+# cache.py
+
+import random
+from array import array
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+from .prefetch import Prefetcher, PrefetchStats
+
+REPLACEMENT_POLICIES = ("lru", "fifo", "random")
+
+
+@dataclass(frozen=True)
+class CacheConfig:
+    size: int = 1024  # Bytes
+    associativity: int = 2
+    line_size: int = 16  # Bytes
+    replacement: str = "lru"
+    hit_latency: int = 1  # Ciclos
+
+    def __post_init__(self):
+        if self.replacement not in REPLACEMENT_POLICIES:
+            raise ValueError(f"Política de substituição desconhecida: {self.replacement}")
+        if self.size % (self.line_size * self.associativity) != 0:
+            raise ValueError("O tamanho da cache deve ser múltiplo de linha * associatividade")
+
+
+class Cache:
+    """Cache associativa por conjunto com tags em arrays contíguos.
+
+    As vias de cada conjunto ocupam posições consecutivas em `tags`,
+    `valid` e `stamps` (um array por campo, sem objetos por linha). A
+    validade fica separada da tag porque qualquer número de linha, inclusive
+    negativo, é um endereço possível.
+    """
+
+    def __init__(self, config: CacheConfig, seed: int = 0):
+        self.config = config
+        self.ways = config.associativity
+        self.sets = config.size // (config.line_size * config.associativity)
+        self.tags = array('q', [0]) * (self.sets * self.ways)
+        self.valid = bytearray(self.sets * self.ways)
+        # LRU: último acesso; FIFO: instante de preenchimento
+        self.stamps = array('q', [0]) * (self.sets * self.ways)
+        self.clock = 0
+        self.random = random.Random(seed)
+        self.hits = 0
+        self.misses = 0
+
+    def _way(self, line: int) -> int:
+        """Posição da linha em `tags`, ou -1 se não estiver na cache"""
+        base = (line % self.sets) * self.ways
+        tags, valid = self.tags, self.valid
+        for slot in range(base, base + self.ways):
+            if valid[slot] and tags[slot] == line:
+                return slot
+        return -1
+
+    def contains(self, line: int) -> bool:
+        return self._way(line) >= 0
+
+    def lookup(self, line: int) -> bool:
+        """Acessa a linha, atualizando contadores e a ordem LRU"""
+        self.clock += 1
+        slot = self._way(line)
+        if slot < 0:
+            self.misses += 1
+            return False
+        self.hits += 1
+        if self.config.replacement == "lru":
+            self.stamps[slot] = self.clock
+        return True
+
+    def invalidate(self, line: int) -> bool:
+        """Remove a linha da cache; retorna se ela estava presente"""
+        slot = self._way(line)
+        if slot < 0:
+            return False
+        self.valid[slot] = 0
+        return True
+
+    def fill(self, line: int) -> Optional[int]:
+        """Insere a linha e retorna a linha expulsa (se houver)"""
+        if self._way(line) >= 0:
+            return None
+        self.clock += 1
+        base = (line % self.sets) * self.ways
+        tags, valid, stamps = self.tags, self.valid, self.stamps
+        victim = -1
+        for slot in range(base, base + self.ways):
+            if not valid[slot]:
+                victim = slot
+                break
+        if victim < 0:
+            if self.config.replacement == "random":
+                victim = base + self.random.randrange(self.ways)
+            else:
+                victim = min(range(base, base + self.ways), key=stamps.__getitem__)
+        evicted = tags[victim] if valid[victim] else None
+        tags[victim] = line
+        valid[victim] = 1
+        stamps[victim] = self.clock
+        return evicted
+
+
+class MemoryHierarchy:
+    """L1 e L2 (opcional) sob as estações de memória, com falhas não bloqueantes.
+
+    Cada falha na L1 ocupa um MSHR até a linha chegar; acessos à mesma linha
+    enquanto ela está a caminho são agrupados no MSHR existente. Com todos
+    os MSHRs ocupados o acesso não pode começar e a emissão para.
+
+    Um `prefetcher` opcional observa os endereços das cargas e busca linhas
+    antecipadamente; cada busca ocupa um MSHR, mas nunca o último livre.
+    """
+
+    def __init__(self, l1: CacheConfig = CacheConfig(), l2: Optional[CacheConfig] = None,
+                 memory_latency: int = 20, mshrs: int = 4, prefetcher: Optional[Prefetcher] = None):
+        if l2 is not None and l2.line_size != l1.line_size:
+            raise ValueError("L1 e L2 devem ter o mesmo tamanho de linha")
+        self.l1_config = l1
+        self.l2_config = l2
+        self.memory_latency = memory_latency
+        self.n_mshrs = mshrs
+        self.prefetcher = prefetcher
+        self.reset()
+
+    def reset(self):
+        """Esvazia as caches e os MSHRs e zera os contadores"""
+        self.l1 = Cache(self.l1_config)
+        self.l2 = Cache(self.l2_config) if self.l2_config is not None else None
+        self.mshrs: Dict[int, int] = {}  # linha -> ciclo em que chega à L1
+        self.mshr_merges = 0
+        self.mshr_full = 0
+        # Linhas buscadas pelo prefetcher e ainda não usadas -> (ciclo da busca, ciclo de chegada)
+        self.prefetched: Dict[int, Tuple[int, int]] = {}
+        self.prefetch_stats = PrefetchStats()
+        if self.prefetcher is not None:
+            self.prefetcher.reset(self.l1_config.line_size)
+
+    @property
+    def min_latency(self) -> int:
+        return self.l1_config.hit_latency
+
+    def line_of(self, address: int) -> int:
+        return address // self.l1_config.line_size
+
+    def _retire(self, cycle: int):
+        """Preenche a L1 com as linhas cujas falhas já foram atendidas"""
+        if not self.mshrs:
+            return
+        arrived = [line for line, ready in self.mshrs.items() if ready <= cycle]
+        for line in arrived:
+            del self.mshrs[line]
+            evicted = self.l1.fill(line)
+            # Linha buscada antecipadamente e expulsa sem uso
+            self.prefetched.pop(evicted, None)
+
+    def access(self, address: int, cycle: int, is_write: bool = False,
+               pc: Optional[int] = None) -> Optional[int]:
+        """Latência do acesso iniciado em `cycle`, ou None se não há MSHR livre.
+
+        Escritas usam write-allocate e são tratadas como leituras da linha.
+        `pc` identifica a carga e treina o prefetcher (escritas não treinam).
+        """
+        self._retire(cycle)
+        line = self.line_of(address)
+        l1_latency = self.l1_config.hit_latency
+
+        if self.l1.lookup(line):
+            self._prefetch_used(line, cycle, late=False)
+            self._prefetch(pc, address, line, cycle, hit=True)
+            return l1_latency
+
+        ready = self.mshrs.get(line)
+        if ready is not None:
+            self.mshr_merges += 1
+            self._prefetch_used(line, cycle, late=True)
+            self._prefetch(pc, address, line, cycle, hit=True)
+            return max(ready - cycle, l1_latency)
+
+        if len(self.mshrs) >= self.n_mshrs:
+            # O acesso será repetido: não conta como nova falha
+            self.l1.misses -= 1
+            self.mshr_full += 1
+            return None
+
+        latency = l1_latency + self._fetch_latency(line)
+        self.mshrs[line] = cycle + latency
+        if not is_write:
+            # A cobertura do prefetcher considera só as falhas de carga
+            self.prefetch_stats.demand_misses += 1
+        self._prefetch(pc, address, line, cycle, hit=False)
+        return latency
+
+    def _prefetch_used(self, line: int, cycle: int, late: bool):
+        """Conta o primeiro uso de uma linha buscada pelo prefetcher"""
+        issued = self.prefetched.pop(line, None)
+        if issued is None:
+            return
+        issue_cycle, ready = issued
+        stats = self.prefetch_stats
+        stats.useful += 1
+        if late:
+            stats.late += 1
+            stats.cycles_hidden += cycle - issue_cycle
+        else:
+            stats.cycles_hidden += ready - issue_cycle
+
+    def _prefetch(self, pc: Optional[int], address: int, line: int, cycle: int, hit: bool):
+        """Treina o prefetcher com a carga e inicia as buscas sugeridas"""
+        if self.prefetcher is None or pc is None:
+            return
+        stats = self.prefetch_stats
+        for target in self.prefetcher.observe(pc, address, line, hit):
+            if target < 0 or target in self.mshrs or self.l1.contains(target):
+                continue
+            if len(self.mshrs) >= self.n_mshrs - 1:
+                stats.dropped += 1
+                continue
+            ready = cycle + self.l1_config.hit_latency + self._fetch_latency(target)
+            self.mshrs[target] = ready
+            self.prefetched[target] = (cycle, ready)
+            stats.issued += 1
+
+    def _fetch_latency(self, line: int) -> int:
+        """Ciclos para trazer a linha da L2 ou da memória após uma falha na L1"""
+        if self.l2 is None:
+            return self.memory_latency
+        if self.l2.lookup(line):
+            return self.l2_config.hit_latency
+        self.l2.fill(line)
+        return self.l2_config.hit_latency + self.memory_latency
+
+    def stats(self) -> Dict[str, int]:
+        stats = {
+            "l1_hits": self.l1.hits,
+            "l1_misses": self.l1.misses,
+            "mshr_merges": self.mshr_merges,
+            "mshr_full": self.mshr_full
+        }
+        if self.l2 is not None:
+            stats["l2_hits"] = self.l2.hits
+            stats["l2_misses"] = self.l2.misses
+        if self.prefetcher is not None:
+            stats.update(self.prefetch_stats.as_metrics())
+        return stats
@@ -0,0 +1,168 @@
+# checkpoint.py
+
+import copy
+import hashlib
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, List, Optional
+from .instructions import Instruction
+from .processor import TomasuloProcessor
+
+# Atributos que dependem só do programa carregado (recalculados em load_program)
+# ou que não fazem parte do estado simulado
+PROGRAM_ATTRIBUTES = frozenset({
+    "instructions", "instruction_status", "_status_rows", "status_changes",
+    "dataflow_bound", "fusion_report", "schedule_result", "commit_listeners"
+})
+STAGES = ("issue", "execute", "write_result", "commit")
+
+
+def prefix_hashes(instructions: List[Instruction]) -> List[bytes]:
+    """Hash encadeado de cada prefixo: o i-ésimo cobre instructions[:i].
+
+    Usa o texto da macro-op, então uma mudança na fusão (ou na ordem do
+    escalonamento estático) também muda o hash.
+    """
+    hashes = [b""]
+    for instruction in instructions:
+        hashes.append(hashlib.blake2b(hashes[-1] + instruction.macro_op.encode(), digest_size=16).digest())
+    return hashes
+
+
+def _status_at(row: Dict, cycle: int) -> Dict:
+    """Linha de instruction_status como estava ao fim de `cycle`"""
+    row = dict(row)
+    for stage in STAGES:
+        if row[stage] and row[f"{stage}_cycle"] > cycle:
+            row[stage] = False
+            row[f"{stage}_cycle"] = None
+    return row
+
+
+@dataclass
+class Checkpoint:
+    """Estado do processador ao fim de um ciclo"""
+    cycle: int
+    fetched: int  # Instruções buscadas até o ciclo
+    prefix_hash: bytes  # Hash de instructions[:fetched]
+    instructions: List[Instruction]  # Programa em que foi tirado (objetos compartilhados com o estado)
+    status: List[Dict]  # instruction_status da execução (marcas de ciclos seguintes são ignoradas)
+    state: Dict[str, Any]
+
+
+class CheckpointStore:
+    """Checkpoints de uma sessão de edição, para re-simular só o que mudou.
+
+    O estado do processador depende apenas das instruções já buscadas, então
+    um checkpoint continua válido para qualquer programa que tenha o mesmo
+    prefixo buscado (mesmo hash). Ao editar a linha K, a simulação continua
+    do último checkpoint tirado antes de K ser buscada. Um checkpoint é
+    tirado a cada `interval` ciclos; acima de `capacity`, metade é
+    descartada e o intervalo dobra, mantendo o espaçamento uniforme.
+    """
+
+    def __init__(self, interval: int = 32, capacity: int = 64):
+        if interval < 1 or capacity < 2:
+            raise ValueError("interval deve ser positivo e capacity pelo menos 2")
+        self.base_interval = interval
+        self.capacity = capacity
+        self.clear()
+
+    def clear(self):
+        self.config: Optional[Hashable] = None
+        self.interval = self.base_interval
+        self.checkpoints: List[Checkpoint] = []
+        self._program: List[str] = []
+        self._hashes: List[bytes] = [b""]
+
+    @staticmethod
+    def _copy(state: Dict[str, Any]) -> Dict[str, Any]:
+        # As instruções não mudam durante a simulação: as referenciadas por
+        # ROB e estações são compartilhadas, não copiadas
+        memo = {}
+        entries = [entry for entry in state["reorder_buffer"].get_all_entries() if entry is not None]
+        stations = state["reservation_stations"].get_all_stations().values()
+        for instruction in [entry.instruction for entry in entries] + [station.instruction for station in stations]:
+            while instruction is not None:
+                memo[id(instruction)] = instruction
+                instruction = instruction.fused
+        return copy.deepcopy(state, memo)
+
+    def record(self, processor: TomasuloProcessor) -> bool:
+        """Tira um checkpoint se já passou o intervalo desde o último"""
+        last = self.checkpoints[-1].cycle if self.checkpoints else 0
+        # Só o programa passado por resume() tem os hashes de prefixo calculados
+        if processor.cycle - last < self.interval or len(self._hashes) != len(processor.instructions) + 1:
+            return False
+        fetched = processor.fetched
+        # Envoltórios do profiler são atributos de instância: não entram no estado
+        state = {name: value for name, value in vars(processor).items()
+                 if name not in PROGRAM_ATTRIBUTES and not callable(value)}
+        state = self._copy(state)
+        stations = state["reservation_stations"]
+        for name in [name for name, value in vars(stations).items() if callable(value)]:
+            delattr(stations, name)
+        self.checkpoints.append(Checkpoint(
+            cycle=processor.cycle,
+            fetched=fetched,
+            prefix_hash=self._hashes[fetched],
+            instructions=processor.instructions,
+            status=processor.instruction_status,
+            state=state
+        ))
+        if len(self.checkpoints) > self.capacity:
+            self.checkpoints = self.checkpoints[1::2]
+            self.interval *= 2
+        return True
+
+    def resume(self, processor: TomasuloProcessor, config: Hashable) -> Optional[int]:
+        """Continua o programa recém-carregado do melhor checkpoint.
+
+        Deve ser chamado logo após load_program. Com o mesmo programa (ou
+        outra configuração) a simulação recomeça do ciclo 0; senão o estado
+        do último checkpoint com o prefixo buscado inalterado é restaurado.
+        Retorna o ciclo restaurado, ou None.
+        """
+        if config != self.config:
+            self.clear()
+            self.config = config
+        program = [instruction.macro_op for instruction in processor.instructions]
+        hashes = prefix_hashes(processor.instructions)
+        changed = program != self._program
+        self._program, self._hashes = program, hashes
+        if not changed:
+            return None
+
+        chosen = None
+        for index in reversed(range(len(self.checkpoints))):
+            checkpoint = self.checkpoints[index]
+            if checkpoint.fetched < len(hashes) and hashes[checkpoint.fetched] == checkpoint.prefix_hash:
+                chosen = index
+                break
+        if chosen is None:
+            self.checkpoints = []
+            self.interval = self.base_interval
+            return None
+        # Os checkpoints seguintes buscaram instruções que mudaram
+        self.checkpoints = self.checkpoints[:chosen + 1]
+        checkpoint = self.checkpoints[chosen]
+        self._restore(processor, checkpoint)
+        return checkpoint.cycle
+
+    def _restore(self, processor: TomasuloProcessor, checkpoint: Checkpoint):
+        state = self._copy(checkpoint.state)
+        # A memória é atualizada no lugar (pode ser compartilhada)
+        memory = state.pop("memory")
+        processor.memory.clear()
+        processor.memory.update(memory)
+        for name, value in state.items():
+            setattr(processor, name, value)
+
+        # Prefixo com os objetos referenciados pelo estado e sufixo do novo programa
+        fetched = checkpoint.fetched
+        processor.instructions = checkpoint.instructions[:fetched] + processor.instructions[fetched:]
+        processor.instruction_status = [_status_at(row, checkpoint.cycle) for row in checkpoint.status[:fetched]] + \
+            processor.instruction_status[fetched:]
+        processor._status_rows = {id(instruction): row for row, instruction in enumerate(processor.instructions)}
+        processor.status_changes = []
+        processor.metrics["total_instructions"] = len(processor.instructions)
+        processor.is_finished = processor.is_program_finished()
@@ -0,0 +1,348 @@
+# engines.py
+
+from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+from .instructions import Instruction, InstructionFactory, STORE_TYPES, VECTOR_TYPES, source_registers
+from .analysis import STATION_CLASS, CONTROL_TYPES
+from .functional import FunctionalExecutor
+from .vector import occupancy, values_equal
+from .processor import DEFAULT_MEMORY, TomasuloProcessor
+
+
+class PipelineEngine(ABC):
+    """Interface comum dos motores de pipeline.
+
+    Os motores recebem o mesmo programa decodificado e a mesma tabela de
+    latências e expõem load_program/load_instructions, step(), cycle,
+    is_finished e get_metrics(), como o TomasuloProcessor. Os valores vêm
+    do FunctionalExecutor, executado em ordem no momento da emissão; cada
+    motor modela apenas o tempo.
+    """
+
+    name = ""
+
+    def __init__(self, latencies: Optional[dict] = None, n_add: int = 3, n_mul: int = 3, n_mem: int = 2,
+                 n_fp_add: int = 2, n_fp_mul: int = 2, n_vector: int = 1, vector_lanes: int = 4):
+        self.latencies = latencies or {}
+        self.units = {"add": n_add, "mul": n_mul, "mem": n_mem, "fp_add": n_fp_add, "fp_mul": n_fp_mul,
+                      "vector": n_vector}
+        self.vector_lanes = vector_lanes
+        self.instructions: List[Instruction] = []
+        self.memory: Dict[int, int] = {}
+        self._reset()
+
+    def load_program(self, program: List[str]):
+        self.load_instructions([InstructionFactory.create_instruction(instr, self.latencies) for instr in program])
+
+    def load_instructions(self, instructions: List[Instruction]):
+        self.instructions = instructions
+        self._reset()
+        # Mesmos valores iniciais de memória do TomasuloProcessor
+        self.memory.update(DEFAULT_MEMORY)
+
+    def _reset(self):
+        self.cycle = 0
+        self.is_finished = False
+        self.metrics = {
+            "total_instructions": len(self.instructions),
+            "total_cycles": 0,
+            "bubble_cycles": 0,
+            "committed_instructions": 0
+        }
+        self.reference = FunctionalExecutor(self.instructions, memory=self.memory)
+        self.memory = self.reference.memory
+
+    def _next_instruction(self) -> Optional[Instruction]:
+        if self.reference.is_finished():
+            return None
+        return self.instructions[self.reference.pc]
+
+    def _latency(self, instruction: Instruction) -> int:
+        """Latência da próxima instrução (vetoriais dependem do VL atual)"""
+        if instruction.type in VECTOR_TYPES:
+            return occupancy(instruction.latency, self.reference.registers["VL"], self.vector_lanes)
+        return instruction.latency
+
+    @abstractmethod
+    def _advance(self) -> bool:
+        """Avança os estágios de um ciclo; retorna se algo progrediu"""
+
+    @abstractmethod
+    def _drained(self) -> bool:
+        """Nenhuma instrução em voo"""
+
+    def step(self) -> bool:
+        if self.is_finished:
+            return False
+        self.cycle += 1
+        self.metrics["total_cycles"] += 1
+        if not self._advance():
+            self.metrics["bubble_cycles"] += 1
+        self.is_finished = self.reference.is_finished() and self._drained()
+        return not self.is_finished
+
+    def get_metrics(self) -> Dict:
+        cycles = self.metrics["total_cycles"]
+        return {
+            **self.metrics,
+            "ipc": self.metrics["committed_instructions"] / cycles if cycles > 0 else 0
+        }
+
+
+class InOrderPipeline(PipelineEngine):
+    """Pipeline em ordem de emissão simples, com adiantamento de resultados.
+
+    Uma instrução por ciclo é emitida, na ordem do programa, quando seus
+    operandos estão disponíveis; caso contrário a emissão para. As unidades
+    funcionais são totalmente pipelinizadas e os resultados são escritos em
+    ordem, um por ciclo. Desvios são resolvidos na emissão.
+    """
+
+    name = "inorder"
+
+    def _reset(self):
+        super()._reset()
+        self.ready_at: Dict[str, int] = {}  # Ciclo em que o valor do registrador pode ser usado
+        self.completions = deque()  # Ciclos de escrita das instruções em voo, em ordem
+        self.last_completion = 0
+
+    def _drained(self) -> bool:
+        return not self.completions
+
+    def _advance(self) -> bool:
+        progressed = False
+        while self.completions and self.completions[0] <= self.cycle:
+            self.completions.popleft()
+            self.metrics["committed_instructions"] += 1
+            progressed = True
+
+        instruction = self._next_instruction()
+        if instruction is None:
+            return progressed
+        if any(self.ready_at.get(reg, 0) > self.cycle for reg in source_registers(instruction)):
+            return progressed
+
+        latency = self._latency(instruction)
+        self.reference.step()
+        if instruction.type in CONTROL_TYPES:
+            self.metrics["committed_instructions"] += 1
+            return True
+        completion = max(self.cycle + latency + 1, self.last_completion + 1)
+        self.last_completion = completion
+        self.completions.append(completion)
+        if instruction.dest and instruction.type not in STORE_TYPES:
+            self.ready_at[instruction.dest] = self.cycle + latency + 1
+        return True
+
+
+@dataclass
+class _Unit:
+    """Unidade funcional do placar (status da unidade no CDC 6600)"""
+    instruction: Optional[Instruction] = None
+    stage: str = ""  # "issued", "execute" ou "done"
+    latency: int = 0
+    remaining: int = 0
+    dest: Optional[str] = None
+    sources: List[str] = field(default_factory=list)
+    waiting_on: Dict[str, "_Unit"] = field(default_factory=dict)  # Fonte -> unidade produtora (Qj/Qk)
+
+
+class ScoreboardEngine(PipelineEngine):
+    """Placar no estilo CDC 6600.
+
+    Unidades funcionais não pipelinizadas (tantas quanto as estações de cada
+    classe) e quatro estágios sem adiantamento: emissão em ordem (para com
+    unidade ocupada ou risco WAW), leitura de operandos (espera RAW),
+    execução e escrita de resultado (espera WAR). Não há ROB: a escrita do
+    resultado conclui a instrução.
+    """
+
+    name = "scoreboard"
+
+    def _reset(self):
+        super()._reset()
+        self.unit_pool: Dict[str, List[_Unit]] = {
+            name: [_Unit() for _ in range(count)] for name, count in self.units.items()
+        }
+        self.all_units: List[_Unit] = [unit for units in self.unit_pool.values() for unit in units]
+        self.result_status: Dict[str, _Unit] = {}  # Registrador -> unidade que o escreverá
+
+    def _drained(self) -> bool:
+        return all(unit.instruction is None for unit in self.all_units)
+
+    def _blocks_write(self, writer: _Unit) -> bool:
+        """WAR: alguma instrução ainda não leu o valor antigo do destino"""
+        for unit in self.all_units:
+            if unit is not writer and unit.stage == "issued" and \
+                    writer.dest in unit.sources and writer.dest not in unit.waiting_on:
+                return True
+        return False
+
+    def _advance(self) -> bool:
+        # Os estágios são decididos sobre o estado do início do ciclo, para
+        # que cada instrução avance no máximo um estágio por ciclo e um
+        # operando escrito só seja lido no ciclo seguinte
+        units = self.all_units
+        writing = [unit for unit in units if unit.stage == "done" and not self._blocks_write(unit)]
+        reading = [unit for unit in units if unit.stage == "issued" and not unit.waiting_on]
+        executing = [unit for unit in units if unit.stage == "execute"]
+
+        for unit in writing:
+            for other in units:
+                for source, producer in list(other.waiting_on.items()):
+                    if producer is unit:
+                        del other.waiting_on[source]
+            if unit.dest is not None and self.result_status.get(unit.dest) is unit:
+                del self.result_status[unit.dest]
+            unit.instruction, unit.stage, unit.dest = None, "", None
+            unit.sources, unit.waiting_on = [], {}
+            self.metrics["committed_instructions"] += 1
+        for unit in executing:
+            unit.remaining -= 1
+            if unit.remaining <= 0:
+                unit.stage = "done"
+        for unit in reading:
+            unit.stage = "execute"
+            unit.remaining = unit.latency
+
+        issued = self._issue()
+        return bool(writing or reading or executing) or issued
+
+    def _issue(self) -> bool:
+        instruction = self._next_instruction()
+        if instruction is None:
+            return False
+        sources = source_registers(instruction)
+
+        if instruction.type in CONTROL_TYPES:
+            # Desvios esperam seus operandos e são resolvidos na emissão
+            if any(reg in self.result_status for reg in sources):
+                return False
+            self.reference.step()
+            self.metrics["committed_instructions"] += 1
+            return True
+
+        dest = instruction.dest if instruction.type not in STORE_TYPES else None
+        if dest is not None and dest in self.result_status:
+            return False  # WAW
+        unit = next((unit for unit in self.unit_pool[STATION_CLASS[instruction.type]]
+                     if unit.instruction is None), None)
+        if unit is None:
+            return False  # Unidade funcional ocupada
+
+        unit.latency = self._latency(instruction)
+        self.reference.step()
+        unit.instruction = instruction
+        unit.stage = "issued"
+        unit.dest = dest
+        unit.sources = sources
+        unit.waiting_on = {reg: self.result_status[reg] for reg in sources if reg in self.result_status}
+        if dest is not None:
+            self.result_status[dest] = unit
+        return True
+
+
+ENGINES = {
+    "inorder": InOrderPipeline,
+    "scoreboard": ScoreboardEngine,
+    "tomasulo": TomasuloProcessor,
+}
+
+
+def _registers(engine) -> Dict:
+    """Registradores arquiteturais ao fim da simulação"""
+    if isinstance(engine, TomasuloProcessor):
+        return engine.register_status.values
+    return engine.reference.registers
+
+
+@dataclass
+class EngineComparison:
+    """Ciclos, IPC e speedup de cada motor sobre o mesmo programa.
+
+    O speedup só tem sentido se os motores fizeram o mesmo trabalho: um
+    motor cujo número de instruções commitadas ou estado final (registradores
+    e memória) difere do baseline é relatado como divergente, sem speedup.
+    """
+    baseline: str
+    metrics: Dict[str, Dict] = field(default_factory=dict)
+    registers: Dict[str, Dict] = field(default_factory=dict)
+    memory: Dict[str, Dict[int, int]] = field(default_factory=dict)
+
+    def record(self, name: str, engine):
+        self.metrics[name] = engine.get_metrics()
+        self.registers[name] = dict(_registers(engine))
+        self.memory[name] = dict(engine.memory)
+
+    def differences(self, engine: str) -> List[str]:
+        """O que difere do baseline: contagem de commits, registradores e endereços"""
+        baseline = self.baseline
+        differences = []
+        committed = self.metrics[engine]["committed_instructions"]
+        expected = self.metrics[baseline]["committed_instructions"]
+        if committed != expected:
+            differences.append(f"committed_instructions: {committed} != {expected}")
+        registers, expected_registers = self.registers.get(engine, {}), self.registers.get(baseline, {})
+        for register in sorted(set(registers) & set(expected_registers)):
+            if not values_equal(registers[register], expected_registers[register]):
+                differences.append(register)
+        memory, expected_memory = self.memory.get(engine, {}), self.memory.get(baseline, {})
+        for address in sorted(set(memory) | set(expected_memory)):
+            if not values_equal(memory.get(address, 0), expected_memory.get(address, 0)):
+                differences.append(f"memória[{address}]")
+        return differences
+
+    def consistent(self, engine: str) -> bool:
+        return not self.differences(engine)
+
+    def speedup(self, engine: str) -> Optional[float]:
+        """Speedup sobre o baseline, ou None se o motor divergiu"""
+        if not self.consistent(engine):
+            return None
+        cycles = self.metrics[engine]["total_cycles"]
+        return self.metrics[self.baseline]["total_cycles"] / cycles if cycles else 0
+
+    def report(self) -> Dict[str, Dict]:
+        report = {}
+        for engine, metrics in self.metrics.items():
+            differences = self.differences(engine)
+            report[engine] = {
+                "cycles": metrics["total_cycles"],
+                "committed_instructions": metrics["committed_instructions"],
+                "ipc": metrics["ipc"],
+                "speedup": self.speedup(engine),
+                "consistent": not differences
+            }
+            if differences:
+                report[engine]["differences"] = differences
+        return report
+
+
+def compare_engines(program: List[str], latencies: Optional[dict] = None, n_add: int = 3, n_mul: int = 3,
+                    n_mem: int = 2, n_fp_add: int = 2, n_fp_mul: int = 2, n_vector: int = 1,
+                    vector_lanes: int = 4, rob_size: int = 8,
+                    engines: Tuple[str, ...] = ("inorder", "scoreboard", "tomasulo"),
+                    baseline: str = "inorder", max_cycles: int = 1_000_000) -> EngineComparison:
+    """Simula o programa em cada motor e calcula o speedup sobre `baseline`"""
+    unknown = (set(engines) | {baseline}) - set(ENGINES)
+    if unknown:
+        raise ValueError(f"Motores desconhecidos: {sorted(unknown)}")
+    if baseline not in engines:
+        engines = (baseline,) + tuple(engines)
+
+    instructions = [InstructionFactory.create_instruction(instr, latencies) for instr in program]
+    units = dict(n_add=n_add, n_mul=n_mul, n_mem=n_mem, n_fp_add=n_fp_add, n_fp_mul=n_fp_mul,
+                 n_vector=n_vector, vector_lanes=vector_lanes)
+    comparison = EngineComparison(baseline=baseline)
+    for name in engines:
+        if name == "tomasulo":
+            engine = TomasuloProcessor(latencies=latencies, rob_size=rob_size, **units)
+        else:
+            engine = ENGINES[name](latencies=latencies, **units)
+        engine.load_instructions(instructions)
+        while engine.cycle < max_cycles and engine.step():
+            pass
+        comparison.record(name, engine)
+    return comparison
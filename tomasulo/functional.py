@@ -0,0 +1,284 @@
+# functional.py
+
+import math
+from dataclasses import dataclass, field
+from statistics import NormalDist, mean, stdev
+from typing import Dict, List, Optional
+from .instructions import Instruction, InstructionType, InstructionFactory, STORE_TYPES, fp_divide
+from . import vector
+from .processor import TomasuloProcessor
+from .reorder_buffer import ROBEntry
+
+
+class FunctionalExecutor:
+    """Executor funcional em ordem: uma instrução por passo, sem modelo de tempo.
+
+    Usa o mesmo programa decodificado e a mesma semântica das operações do
+    TomasuloProcessor, servindo para avançar rapidamente (fast-forward) e
+    como referência do estado arquitetural.
+    """
+
+    def __init__(self, instructions: List[Instruction], memory: Optional[Dict[int, int]] = None,
+                 registers: Optional[Dict[str, int]] = None):
+        self.instructions = instructions
+        self.memory: Dict[int, int] = dict(memory) if memory else {}
+        self.registers: Dict[str, int] = {f"R{i}": 0 for i in range(32)}
+        self.registers.update({f"F{i}": 0.0 for i in range(32)})
+        self.registers.update({reg: vector.empty_vector() for reg in vector.VECTOR_REGISTERS})
+        self.registers["VL"] = vector.MAX_VECTOR_LENGTH
+        if registers:
+            self.registers.update(registers)
+        self.pc = 0
+        self.executed = 0
+
+    def is_finished(self) -> bool:
+        return not 0 <= self.pc < len(self.instructions)
+
+    def step(self) -> Optional[Instruction]:
+        """Executa a próxima instrução e a retorna (None se o programa terminou)"""
+        if self.is_finished():
+            return None
+        instruction = self.instructions[self.pc]
+        regs = self.registers
+        op = instruction.type
+        next_pc = self.pc + 1
+
+        if op == InstructionType.ADD:
+            regs[instruction.dest] = regs[instruction.src1] + regs[instruction.src2]
+        elif op == InstructionType.SUB:
+            regs[instruction.dest] = regs[instruction.src1] - regs[instruction.src2]
+        elif op == InstructionType.MUL:
+            regs[instruction.dest] = regs[instruction.src1] * regs[instruction.src2]
+        elif op == InstructionType.DIV:
+            # Mesma convenção do processador: divisão por zero usa divisor 1
+            regs[instruction.dest] = regs[instruction.src1] // (regs[instruction.src2] or 1)
+        elif op == InstructionType.LD:
+            regs[instruction.dest] = self.memory.get(self.address(instruction), 0)
+        elif op == InstructionType.ST or op == InstructionType.S_D:
+            self.memory[self.address(instruction)] = regs[instruction.dest]
+        elif op == InstructionType.ADD_D:
+            regs[instruction.dest] = float(regs[instruction.src1]) + float(regs[instruction.src2])
+        elif op == InstructionType.SUB_D:
+            regs[instruction.dest] = float(regs[instruction.src1]) - float(regs[instruction.src2])
+        elif op == InstructionType.MUL_D:
+            regs[instruction.dest] = float(regs[instruction.src1]) * float(regs[instruction.src2])
+        elif op == InstructionType.DIV_D:
+            regs[instruction.dest] = fp_divide(float(regs[instruction.src1]), float(regs[instruction.src2]))
+        elif op == InstructionType.L_D:
+            regs[instruction.dest] = float(self.memory.get(self.address(instruction), 0))
+        elif op == InstructionType.SETVL:
+            regs["VL"] = vector.clamp_length(regs[instruction.src1])
+        elif op == InstructionType.VLD:
+            regs[instruction.dest] = vector.load(self.memory, self.address(instruction), regs["VL"])
+        elif op == InstructionType.VST:
+            vector.store(self.memory, self.address(instruction), regs[instruction.dest], regs["VL"])
+        elif op == InstructionType.VADD:
+            regs[instruction.dest] = vector.add(regs[instruction.src1], regs[instruction.src2], regs["VL"])
+        elif op == InstructionType.VMUL:
+            regs[instruction.dest] = vector.multiply(regs[instruction.src1], regs[instruction.src2], regs["VL"])
+        elif op == InstructionType.BEQ:
+            if regs[instruction.src1] == regs[instruction.src2]:
+                next_pc += instruction.immediate or 0
+        elif op == InstructionType.BNE:
+            if regs[instruction.src1] != regs[instruction.src2]:
+                next_pc += instruction.immediate or 0
+        elif op == InstructionType.J:
+            next_pc += instruction.immediate or 0
+
+        self.pc = next_pc
+        self.executed += 1
+        return instruction
+
+    def address(self, instruction: Instruction) -> int:
+        base = self.registers[instruction.src1] if instruction.src1 else 0
+        # NaN e infinito (ex.: DIV.D por zero) não formam endereço; usa-se 0
+        if isinstance(base, float) and not math.isfinite(base):
+            base = 0
+        return int(base) + (instruction.immediate or 0)
+
+    def run(self, count: int) -> int:
+        """Executa até count instruções e retorna quantas foram executadas"""
+        executed = 0
+        while executed < count and self.step() is not None:
+            executed += 1
+        return executed
+
+
+class GoldenChecker:
+    """Compara cada commit do TomasuloProcessor com o modelo funcional.
+
+    Os commits acontecem em ordem de programa, então o executor funcional
+    avança até a próxima instrução que passa pelo ROB e o valor commitado é
+    comparado com o valor arquitetural esperado. Ao primeiro desvio de fluxo
+    (instrução diferente da esperada) a verificação é interrompida.
+    """
+
+    def __init__(self, processor: TomasuloProcessor, reference: Optional[FunctionalExecutor] = None):
+        self.processor = processor
+        if reference is None:
+            reference = FunctionalExecutor(processor.instructions, memory=processor.memory,
+                                           registers=processor.register_status.values)
+            reference.pc = processor.current_instruction
+        self.reference = reference
+        self.checked = 0
+        self.mismatches: List[Dict] = []
+        self.diverged = False
+        processor.commit_listeners.append(self.on_commit)
+
+    def detach(self):
+        if self.on_commit in self.processor.commit_listeners:
+            self.processor.commit_listeners.remove(self.on_commit)
+
+    def on_commit(self, entry: ROBEntry):
+        if self.diverged:
+            return
+        reference = self.reference
+        # Desvios não passam pelo ROB: o executor funcional os resolve sozinho
+        expected = reference.step()
+        while expected is not None and expected.type in (InstructionType.BEQ, InstructionType.BNE, InstructionType.J):
+            expected = reference.step()
+
+        if expected is not entry.instruction:
+            self.diverged = True
+            self.mismatches.append({
+                "instruction": str(entry.instruction),
+                "expected_instruction": str(expected) if expected else None,
+                "cycle": self.processor.cycle
+            })
+            return
+        if expected.fused is not None:
+            # A macro-op commita o resultado da segunda instrução do par
+            expected = reference.step()
+
+        if expected.type == InstructionType.VST:
+            expected_value = vector.load(reference.memory, reference.address(expected), reference.registers["VL"])
+        elif expected.type in STORE_TYPES:
+            expected_value = reference.memory.get(reference.address(expected), 0)
+        else:
+            expected_value = reference.registers[expected.dest]
+        self.checked += 1
+        if not vector.values_equal(entry.value, expected_value):
+            self.mismatches.append({
+                "instruction": str(entry.instruction),
+                "expected": expected_value,
+                "committed": entry.value,
+                "cycle": self.processor.cycle
+            })
+
+    @property
+    def ok(self) -> bool:
+        return not self.mismatches
+
+
+@dataclass
+class SampledResult:
+    """Estimativa de ciclos/IPC obtida por amostragem"""
+    instructions: int
+    samples: List[float] = field(default_factory=list)  # CPI de cada janela medida
+    confidence: float = 0.95
+
+    @property
+    def cpi(self) -> float:
+        return mean(self.samples) if self.samples else 0
+
+    @property
+    def cpi_error(self) -> float:
+        """Meia largura do intervalo de confiança do CPI médio"""
+        if len(self.samples) < 2:
+            return math.inf
+        z = NormalDist().inv_cdf(0.5 + self.confidence / 2)
+        return z * stdev(self.samples) / math.sqrt(len(self.samples))
+
+    @property
+    def estimated_cycles(self) -> float:
+        return self.cpi * self.instructions
+
+    @property
+    def cycles_bounds(self) -> tuple:
+        error = self.cpi_error * self.instructions
+        return max(0.0, self.estimated_cycles - error), self.estimated_cycles + error
+
+    @property
+    def ipc(self) -> float:
+        return 1 / self.cpi if self.cpi > 0 else 0
+
+    @property
+    def ipc_bounds(self) -> tuple:
+        low_cpi = max(self.cpi - self.cpi_error, 0)
+        high_cpi = self.cpi + self.cpi_error
+        return (1 / high_cpi if high_cpi > 0 else 0), (1 / low_cpi if low_cpi > 0 else math.inf)
+
+
+class SampledSimulation:
+    """Simulação amostrada: avança funcionalmente e mede janelas detalhadas.
+
+    A cada intervalo de `interval` instruções, o executor funcional entrega
+    seu estado a um TomasuloProcessor, que roda `warmup` instruções para
+    encher o pipeline e mede o CPI das `window` instruções seguintes. O total
+    de ciclos é extrapolado pelo CPI médio das janelas.
+    """
+
+    def __init__(self, program: List[str], latencies: Optional[dict] = None, n_add: int = 3,
+                 n_mul: int = 3, n_mem: int = 2, n_fp_add: int = 2, n_fp_mul: int = 2, rob_size: int = 8,
+                 interval: int = 10_000, window: int = 1_000,
+                 warmup: int = 200, memory: Optional[Dict[int, int]] = None, confidence: float = 0.95,
+                 max_window_cycles: int = 1_000_000):
+        if window + warmup > interval:
+            raise ValueError("O intervalo deve comportar o aquecimento e a janela medida")
+        self.latencies = latencies or {}
+        self.n_add = n_add
+        self.n_mul = n_mul
+        self.n_mem = n_mem
+        self.n_fp_add = n_fp_add
+        self.n_fp_mul = n_fp_mul
+        self.rob_size = rob_size
+        self.interval = interval
+        self.window = window
+        self.warmup = warmup
+        self.confidence = confidence
+        self.max_window_cycles = max_window_cycles
+        # Decodificado uma única vez e compartilhado pelos dois modelos
+        self.instructions = [InstructionFactory.create_instruction(instr, self.latencies) for instr in program]
+        # Um único processador detalhado é reiniciado a cada janela
+        self.processor = TomasuloProcessor(latencies=self.latencies, n_add=n_add, n_mul=n_mul, n_mem=n_mem,
+                                           n_fp_add=n_fp_add, n_fp_mul=n_fp_mul, rob_size=rob_size)
+        self.processor.load_instructions(self.instructions)
+        self.initial_memory = dict(self.processor.memory)
+        if memory:
+            self.initial_memory.update(memory)
+
+    def _measure(self, functional: FunctionalExecutor) -> Optional[float]:
+        """Roda uma janela detalhada a partir do estado funcional e retorna o CPI"""
+        processor = self.processor
+        processor.warm_start(functional.pc, functional.registers, functional.memory)
+        start_cycle = start_committed = None
+        while processor.cycle < self.max_window_cycles:
+            running = processor.step()
+            committed = processor.metrics["committed_instructions"]
+            if start_cycle is None and committed >= self.warmup:
+                start_cycle, start_committed = processor.cycle, committed
+            if start_cycle is not None and committed - start_committed >= self.window:
+                break
+            if not running:
+                break
+        if start_cycle is None:
+            return None
+        measured = processor.metrics["committed_instructions"] - start_committed
+        if measured <= 0:
+            return None
+        return (processor.cycle - start_cycle) / measured
+
+    def run(self) -> SampledResult:
+        functional = FunctionalExecutor(self.instructions, memory=self.initial_memory)
+        samples = []
+        skip = self.interval - self.window - self.warmup
+        while not functional.is_finished():
+            functional.run(skip)
+            if functional.is_finished():
+                break
+            cpi = self._measure(functional)
+            if cpi is not None:
+                samples.append(cpi)
+            # O executor funcional continua sendo a referência do estado
+            functional.run(self.warmup + self.window)
+        return SampledResult(instructions=functional.executed, samples=samples, confidence=self.confidence)
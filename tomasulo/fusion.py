@@ -0,0 +1,127 @@
+# fusion.py
+
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set
+from .instructions import Instruction, InstructionType, STORE_TYPES, source_registers
+from .analysis import CONTROL_TYPES
+
+SCALAR_LOAD_TYPES = (InstructionType.LD, InstructionType.L_D)
+
+# Regras de fusão: nome -> (tipos da primeira instrução, tipos da segunda)
+FUSION_RULES = {
+    "load_add": (SCALAR_LOAD_TYPES, (InstructionType.ADD, InstructionType.SUB,
+                                     InstructionType.ADD_D, InstructionType.SUB_D)),
+    "load_mul": (SCALAR_LOAD_TYPES, (InstructionType.MUL, InstructionType.DIV,
+                                     InstructionType.MUL_D, InstructionType.DIV_D)),
+}
+
+DEFAULT_FUSION_RULES = ("load_add",)
+
+
+@dataclass
+class FusionReport:
+    """Resultado estático da passagem de fusão sobre um programa"""
+    instructions: int
+    candidates: int = 0  # Pares com a forma de alguma regra, fundidos ou não
+    pairs: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def fused_pairs(self) -> int:
+        return sum(self.pairs.values())
+
+    @property
+    def fusion_rate(self) -> float:
+        """Fração das instruções do programa que fazem parte de uma macro-op"""
+        return 2 * self.fused_pairs / self.instructions if self.instructions else 0
+
+    def as_metrics(self) -> Dict[str, float]:
+        metrics = {
+            "fusion_candidates": self.candidates,
+            "fused_pairs": self.fused_pairs,
+            "fusion_rate": self.fusion_rate
+        }
+        for rule, count in self.pairs.items():
+            metrics[f"fused_{rule}"] = count
+        return metrics
+
+
+def _writes(instruction: Instruction) -> Optional[str]:
+    if instruction.type in STORE_TYPES or instruction.type in CONTROL_TYPES:
+        return None
+    return instruction.dest
+
+
+def branch_targets(instructions: List[Instruction]) -> Set[int]:
+    """Índices que podem ser alcançados por um desvio"""
+    targets = set()
+    for index, instruction in enumerate(instructions):
+        if instruction.type in CONTROL_TYPES and instruction.immediate is not None:
+            targets.add(index + 1 + instruction.immediate)
+            if instruction.type == InstructionType.J:
+                targets.add(instruction.immediate)
+    return targets
+
+
+def _intermediate_dead(instructions: List[Instruction], tail_index: int, register: str,
+                       targets: Set[int]) -> bool:
+    """Indica se o valor carregado não é lido depois da segunda instrução.
+
+    A macro-op escreve apenas o destino da segunda instrução, então o
+    registrador intermediário precisa ser sobrescrito antes de qualquer
+    leitura, em código linear (sem desvios nem alvos de desvio no caminho).
+    """
+    if instructions[tail_index].dest == register:
+        return True
+    for index in range(tail_index + 1, len(instructions)):
+        instruction = instructions[index]
+        if index in targets or instruction.type in CONTROL_TYPES:
+            return False
+        if register in source_registers(instruction):
+            return False
+        if _writes(instruction) == register:
+            return True
+    # Ainda vivo ao fim do programa: é parte do estado arquitetural final
+    return False
+
+
+def _match(head: Instruction, tail: Instruction, rules: Iterable[str]) -> Optional[str]:
+    if head.dest is None or head.dest not in (tail.src1, tail.src2):
+        return None
+    for rule in rules:
+        head_types, tail_types = FUSION_RULES[rule]
+        if head.type in head_types and tail.type in tail_types:
+            return rule
+    return None
+
+
+def fuse(instructions: List[Instruction], rules: Iterable[str] = DEFAULT_FUSION_RULES) -> FusionReport:
+    """Marca os pares fundíveis (head.fused = tail) sem alterar a lista.
+
+    Manter a lista intacta preserva os deslocamentos dos desvios; a emissão
+    avança duas posições ao encontrar uma macro-op.
+    """
+    rules = tuple(rules)
+    unknown = set(rules) - set(FUSION_RULES)
+    if unknown:
+        raise ValueError(f"Regras de fusão desconhecidas: {sorted(unknown)}")
+
+    for instruction in instructions:
+        instruction.fused = None
+    report = FusionReport(instructions=len(instructions), pairs={rule: 0 for rule in rules})
+    if not rules:
+        return report
+
+    targets = branch_targets(instructions)
+    index = 0
+    while index < len(instructions) - 1:
+        head, tail = instructions[index], instructions[index + 1]
+        rule = _match(head, tail, rules)
+        if rule is not None:
+            report.candidates += 1
+            if index + 1 not in targets and _intermediate_dead(instructions, index + 1, head.dest, targets):
+                head.fused = tail
+                report.pairs[rule] += 1
+                index += 2
+                continue
+        index += 1
+    return report
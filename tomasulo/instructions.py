@@ -1,5 +1,6 @@
+import math
 from enum import Enum
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Optional, List
 
 class InstructionType(Enum):
@@ -12,6 +13,29 @@ class InstructionType(Enum):
     BEQ = "BEQ"  # Branch if equal
     BNE = "BNE"  # Branch if not equal
     J = "J"    # Jump
+    # Ponto flutuante (precisão dupla, registradores F)
+    ADD_D = "ADD.D"
+    SUB_D = "SUB.D"
+    MUL_D = "MUL.D"
+    DIV_D = "DIV.D"
+    L_D = "L.D"  # Load FP
+    S_D = "S.D"  # Store FP
+    # Vetoriais (registradores V, comprimento em VL)
+    VLD = "VLD"
+    VST = "VST"
+    VADD = "VADD"
+    VMUL = "VMUL"
+    SETVL = "SETVL"  # VL <- min(rs, MAX_VECTOR_LENGTH)
+
+ARITHMETIC_TYPES = (InstructionType.ADD, InstructionType.SUB, InstructionType.MUL, InstructionType.DIV,
+                    InstructionType.ADD_D, InstructionType.SUB_D, InstructionType.MUL_D, InstructionType.DIV_D,
+                    InstructionType.VADD, InstructionType.VMUL)
+LOAD_TYPES = (InstructionType.LD, InstructionType.L_D, InstructionType.VLD)
+STORE_TYPES = (InstructionType.ST, InstructionType.S_D, InstructionType.VST)
+MEMORY_TYPES = LOAD_TYPES + STORE_TYPES
+FP_TYPES = (InstructionType.ADD_D, InstructionType.SUB_D, InstructionType.MUL_D, InstructionType.DIV_D,
+            InstructionType.L_D, InstructionType.S_D)
+VECTOR_TYPES = (InstructionType.VLD, InstructionType.VST, InstructionType.VADD, InstructionType.VMUL)
 
 @dataclass
 class Instruction:
@@ -22,18 +46,45 @@ class Instruction:
     immediate: Optional[int] = None  # Valor imediato
     address: Optional[int] = None  # Endereço para load/store
     latency: int = 1  # Latência da instrução em ciclos
-    
+    # Instrução seguinte fundida a esta em uma macro-op (ver fusion.py)
+    fused: Optional["Instruction"] = field(default=None, repr=False, compare=False)
+
+    @property
+    def macro_op(self) -> str:
+        """Texto da instrução incluindo a que foi fundida a ela"""
+        return f"{self} + {self.fused}" if self.fused is not None else str(self)
+
     def __str__(self) -> str:
-        if self.type in [InstructionType.ADD, InstructionType.SUB, InstructionType.MUL, InstructionType.DIV]:
+        if self.type in ARITHMETIC_TYPES:
             return f"{self.type.value} {self.dest}, {self.src1}, {self.src2}"
-        elif self.type in [InstructionType.LD, InstructionType.ST]:
+        elif self.type in MEMORY_TYPES:
             return f"{self.type.value} {self.dest}, {self.immediate}({self.src1})"
         elif self.type in [InstructionType.BEQ, InstructionType.BNE]:
             return f"{self.type.value} {self.src1}, {self.src2}, {self.immediate}"
         elif self.type == InstructionType.J:
             return f"{self.type.value} {self.immediate}"
+        elif self.type == InstructionType.SETVL:
+            return f"{self.type.value} {self.src1}"
         return ""
 
+def source_registers(instruction: Instruction) -> List[str]:
+    """Registradores lidos pela instrução (base e dado para ST/S.D, VL para vetores)"""
+    if instruction.type in STORE_TYPES:
+        registers = (instruction.dest, instruction.src1)
+    else:
+        registers = (instruction.src1, instruction.src2)
+    if instruction.type in VECTOR_TYPES:
+        registers += ("VL",)
+    return [register for register in registers if register]
+
+def fp_divide(dividend: float, divisor: float) -> float:
+    """Divisão em float64 seguindo IEEE 754 (±inf ou nan na divisão por zero)"""
+    if divisor == 0:
+        if dividend == 0 or math.isnan(dividend):
+            return math.nan
+        return math.copysign(math.inf, dividend) * math.copysign(1.0, divisor)
+    return dividend / divisor
+
 class InstructionFactory:
     @staticmethod
     def create_instruction(instruction_str: str, latencies: dict = None) -> Instruction:
@@ -41,22 +92,32 @@ class InstructionFactory:
         op = parts[0].upper()
         latencies = latencies or {}
         
-        if op in ["ADD", "SUB", "MUL", "DIV"]:
+        if op in ["ADD", "SUB", "MUL", "DIV", "ADD.D", "SUB.D", "MUL.D", "DIV.D", "VADD", "VMUL"]:
             latency = latencies.get(op, 1)  # Valor padrão mínimo
-            return Instruction(
-                type=InstructionType[op],
+            instruction = Instruction(
+                type=InstructionType(op),
                 dest=parts[1].strip(','),
                 src1=parts[2].strip(','),
                 src2=parts[3],
                 latency=latency
             )
-        elif op in ["LD", "ST"]:
+            if op.endswith(".D"):
+                InstructionFactory._check_fp_registers(instruction_str, instruction.dest, instruction.src1, instruction.src2)
+            elif op.startswith("V"):
+                InstructionFactory._check_registers(instruction_str, "V", instruction.dest, instruction.src1, instruction.src2)
+            return instruction
+        elif op in ["LD", "ST", "L.D", "S.D", "VLD", "VST"]:
             # Formato: LD/ST rd, offset(rs)
             dest = parts[1].strip(',')
             offset_rs = parts[2].strip('()').split('(')
             latency = latencies.get(op, 1)  # Valor padrão mínimo
+            if op.endswith(".D"):
+                # O dado é um registrador F; a base do endereço continua inteira
+                InstructionFactory._check_fp_registers(instruction_str, dest)
+            elif op.startswith("V"):
+                InstructionFactory._check_registers(instruction_str, "V", dest)
             return Instruction(
-                type=InstructionType[op],
+                type=InstructionType(op),
                 dest=dest,
                 src1=offset_rs[1],
                 immediate=int(offset_rs[0]),
@@ -71,6 +132,13 @@ class InstructionFactory:
                 immediate=int(parts[3]),
                 latency=latency
             )
+        elif op == "SETVL":
+            return Instruction(
+                type=InstructionType.SETVL,
+                dest="VL",
+                src1=parts[1],
+                latency=latencies.get(op, 1)
+            )
         elif op == "J":
             latency = latencies.get(op, 1)  # Valor padrão mínimo
             return Instruction(
@@ -78,4 +146,15 @@ class InstructionFactory:
                 immediate=int(parts[1]),
                 latency=latency
             )
-        raise ValueError(f"Instrução não reconhecida: {instruction_str}") 
\ No newline at end of file
+        raise ValueError(f"Instrução não reconhecida: {instruction_str}")
+
+    @staticmethod
+    def _check_fp_registers(instruction_str: str, *registers: str):
+        InstructionFactory._check_registers(instruction_str, "F", *registers)
+
+    @staticmethod
+    def _check_registers(instruction_str: str, prefix: str, *registers: str):
+        for register in registers:
+            if not register.upper().startswith(prefix):
+                kind = "de ponto flutuante" if prefix == "F" else "vetoriais"
+                raise ValueError(f"Instruções {kind} usam registradores {prefix}: {instruction_str}") 
\ No newline at end of file
@@ -0,0 +1,247 @@
+# multicore.py
+
+from typing import Dict, List, Optional, Tuple
+from .cache import CacheConfig, MemoryHierarchy
+from .processor import TomasuloProcessor
+
+# Estados MESI de uma linha em uma cache privada (ausente = "I")
+MODIFIED, EXCLUSIVE, SHARED, INVALID = "M", "E", "S", "I"
+
+BUS_TRANSACTIONS = ("bus_reads", "bus_read_exclusive", "bus_upgrades")
+
+
+class CoherenceBus:
+    """Barramento compartilhado com snooping entre as caches privadas.
+
+    Cada transação (BusRd, BusRdX ou BusUpgr) ocupa o barramento por
+    `latency` ciclos; transações concorrentes são serializadas, de modo que
+    o compartilhamento também custa tempo de espera.
+    """
+
+    def __init__(self, latency: int = 4):
+        self.latency = latency
+        self.caches: List["CoherentHierarchy"] = []
+        self.reset()
+
+    def reset(self):
+        self.free_at = 0
+        self.counters = {name: 0 for name in BUS_TRANSACTIONS}
+        self.counters.update(invalidations=0, cache_to_cache=0, writebacks=0, bus_wait_cycles=0)
+
+    def attach(self, cache: "CoherentHierarchy"):
+        self.caches.append(cache)
+
+    def transaction(self, kind: str, requester: "CoherentHierarchy", line: int,
+                    cycle: int) -> Tuple[int, bool, bool]:
+        """Difunde a transação para as demais caches.
+
+        Retorna (ciclos até o fim da transação, se outra cache mantém a
+        linha, se outra cache forneceu os dados).
+        """
+        start = max(cycle, self.free_at)
+        self.free_at = start + self.latency
+        self.counters[kind] += 1
+        self.counters["bus_wait_cycles"] += start - cycle
+        requester.bus_transactions += 1
+
+        exclusive = kind != "bus_reads"
+        shared = supplied = False
+        for cache in self.caches:
+            if cache is requester:
+                continue
+            state = cache.snoop(line, exclusive)
+            if state == INVALID:
+                continue
+            if state == MODIFIED:
+                self.counters["writebacks"] += 1
+            if state in (MODIFIED, EXCLUSIVE):
+                supplied = True
+            if exclusive:
+                self.counters["invalidations"] += 1
+            else:
+                shared = True
+        if supplied and kind != "bus_upgrades":
+            self.counters["cache_to_cache"] += 1
+        return self.free_at - cycle, shared, supplied
+
+    def stats(self) -> Dict[str, int]:
+        return dict(self.counters)
+
+
+class CoherentHierarchy(MemoryHierarchy):
+    """Hierarquia privada de um núcleo com L1 mantida coerente por MESI.
+
+    O estado MESI é mantido para as linhas da L1 e para as falhas em
+    andamento (alvo do MSHR). Os dados vivem na memória compartilhada do
+    sistema; o protocolo determina apenas a latência e o tráfego.
+    """
+
+    def __init__(self, bus: CoherenceBus, l1: CacheConfig = CacheConfig(),
+                 l2: Optional[CacheConfig] = None, memory_latency: int = 20, mshrs: int = 4):
+        self.bus = bus
+        super().__init__(l1, l2, memory_latency, mshrs)
+        bus.attach(self)
+
+    def reset(self):
+        super().reset()
+        self.states: Dict[int, str] = {}   # linha na L1 -> M, E ou S
+        self.pending: Dict[int, str] = {}  # linha no MSHR -> estado ao chegar
+        self.bus_transactions = 0
+        self.invalidations_received = 0
+
+    def _retire(self, cycle: int):
+        if not self.mshrs:
+            return
+        arrived = [line for line, ready in self.mshrs.items() if ready <= cycle]
+        for line in arrived:
+            del self.mshrs[line]
+            evicted = self.l1.fill(line)
+            self.states[line] = self.pending.pop(line)
+            if evicted is not None and self.states.pop(evicted, INVALID) == MODIFIED:
+                self.bus.counters["writebacks"] += 1
+
+    def snoop(self, line: int, exclusive: bool) -> str:
+        """Reage a uma transação de outro núcleo e retorna o estado anterior"""
+        if line in self.pending:
+            # Os dados ainda não chegaram: a cópia conta como limpa e não
+            # pode ser fornecida a outra cache
+            if exclusive:
+                del self.pending[line]
+                del self.mshrs[line]
+                self.invalidations_received += 1
+            else:
+                self.pending[line] = SHARED
+            return SHARED
+
+        state = self.states.get(line, INVALID)
+        if state == INVALID:
+            return state
+        if exclusive:
+            del self.states[line]
+            self.l1.invalidate(line)
+            if self.l2 is not None:
+                self.l2.invalidate(line)
+            self.invalidations_received += 1
+        else:
+            self.states[line] = SHARED
+        return state
+
+    def access(self, address: int, cycle: int, is_write: bool = False,
+               pc: Optional[int] = None) -> Optional[int]:
+        # Prefetch não é modelado sob coerência: `pc` é ignorado
+        self._retire(cycle)
+        line = self.line_of(address)
+        l1_latency = self.l1_config.hit_latency
+
+        if self.l1.lookup(line):
+            state = self.states.get(line, INVALID)
+            if not is_write or state == MODIFIED:
+                return l1_latency
+            if state == EXCLUSIVE:
+                self.states[line] = MODIFIED
+                return l1_latency
+            # Escrita em linha compartilhada: invalida as outras cópias
+            bus_cycles, _, _ = self.bus.transaction("bus_upgrades", self, line, cycle)
+            self.states[line] = MODIFIED
+            return l1_latency + bus_cycles
+
+        ready = self.mshrs.get(line)
+        if ready is not None:
+            self.mshr_merges += 1
+            latency = max(ready - cycle, l1_latency)
+            if is_write and self.pending[line] != MODIFIED:
+                if self.pending[line] == SHARED:
+                    bus_cycles, _, _ = self.bus.transaction("bus_upgrades", self, line, cycle)
+                    latency = max(latency, l1_latency + bus_cycles)
+                self.pending[line] = MODIFIED
+            return latency
+
+        if len(self.mshrs) >= self.n_mshrs:
+            self.l1.misses -= 1
+            self.mshr_full += 1
+            return None
+
+        kind = "bus_read_exclusive" if is_write else "bus_reads"
+        bus_cycles, shared, supplied = self.bus.transaction(kind, self, line, cycle)
+        latency = l1_latency + bus_cycles
+        if not supplied:
+            latency += self._fetch_latency(line)
+        self.mshrs[line] = cycle + latency
+        if is_write:
+            self.pending[line] = MODIFIED
+        else:
+            self.pending[line] = SHARED if shared else EXCLUSIVE
+        return latency
+
+    def stats(self) -> Dict[str, int]:
+        stats = super().stats()
+        stats["bus_transactions"] = self.bus_transactions
+        stats["invalidations_received"] = self.invalidations_received
+        return stats
+
+
+class MultiCoreSystem:
+    """Vários TomasuloProcessor sobre uma memória compartilhada coerente.
+
+    Cada núcleo tem L1 (e L2 opcional) privadas ligadas por um barramento
+    com snooping MESI. Todos avançam no mesmo laço de ciclos globais; a
+    ordem dos núcleos em cada ciclo é rotacionada para que a prioridade no
+    barramento seja justa.
+    """
+
+    def __init__(self, n_cores: int = 2, latencies: Optional[dict] = None,
+                 l1: CacheConfig = CacheConfig(), l2: Optional[CacheConfig] = None,
+                 memory_latency: int = 20, mshrs: int = 4, interconnect_latency: int = 4,
+                 **core_options):
+        if n_cores < 1:
+            raise ValueError("O sistema precisa de pelo menos um núcleo")
+        self.bus = CoherenceBus(interconnect_latency)
+        self.memory: Dict[int, int] = {}  # Memória compartilhada por todos os núcleos
+        self.cores: List[TomasuloProcessor] = []
+        for _ in range(n_cores):
+            hierarchy = CoherentHierarchy(self.bus, l1, l2, memory_latency, mshrs)
+            core = TomasuloProcessor(latencies=latencies, memory_hierarchy=hierarchy, **core_options)
+            core.memory = self.memory
+            self.cores.append(core)
+        self.cycle = 0
+
+    def load_programs(self, programs: List[List[str]]):
+        """Carrega um programa por núcleo e reinicia o sistema"""
+        if len(programs) != len(self.cores):
+            raise ValueError(f"Esperados {len(self.cores)} programas, recebidos {len(programs)}")
+        self.cycle = 0
+        self.memory.clear()
+        self.bus.reset()
+        for core, program in zip(self.cores, programs):
+            core.load_program(program)
+
+    def is_finished(self) -> bool:
+        return all(core.is_finished for core in self.cores)
+
+    def step(self) -> bool:
+        """Avança um ciclo global; retorna False quando todos os núcleos terminam"""
+        if self.is_finished():
+            return False
+        self.cycle += 1
+        n_cores = len(self.cores)
+        for offset in range(n_cores):
+            core = self.cores[(self.cycle + offset) % n_cores]
+            if not core.is_finished:
+                core.step()
+        return not self.is_finished()
+
+    def run(self, max_cycles: int = 1_000_000) -> int:
+        while self.cycle < max_cycles and self.step():
+            pass
+        return self.cycle
+
+    def get_metrics(self) -> Dict:
+        """Métricas por núcleo, IPC do sistema e tráfego de coerência"""
+        committed = sum(core.metrics["committed_instructions"] for core in self.cores)
+        return {
+            "total_cycles": self.cycle,
+            "committed_instructions": committed,
+            "ipc": committed / self.cycle if self.cycle > 0 else 0,
+            **self.bus.stats(),
+            "cores": [core.get_metrics() for core in self.cores]
+        }
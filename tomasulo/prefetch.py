@@ -0,0 +1,174 @@
+# prefetch.py
+
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+
+class Prefetcher(ABC):
+    """Interface dos prefetchers de hardware.
+
+    O prefetcher observa os endereços das cargas calculados na emissão e
+    devolve as linhas que devem ser trazidas para a L1. A hierarquia
+    descarta as linhas já presentes ou a caminho.
+    """
+
+    name = ""
+
+    def __init__(self, degree: int = 1):
+        if degree < 1:
+            raise ValueError("O grau do prefetcher deve ser positivo")
+        self.degree = degree
+        self.reset(16)
+
+    def reset(self, line_size: int):
+        self.line_size = line_size
+
+    @abstractmethod
+    def observe(self, pc: int, address: int, line: int, hit: bool) -> List[int]:
+        """Linhas a buscar após a carga `pc` acessar `address`"""
+
+
+class NextLinePrefetcher(Prefetcher):
+    """Busca as `degree` linhas seguintes a cada falha na L1"""
+
+    name = "next_line"
+
+    def observe(self, pc: int, address: int, line: int, hit: bool) -> List[int]:
+        if hit:
+            return []
+        return [line + offset for offset in range(1, self.degree + 1)]
+
+
+class StridePrefetcher(Prefetcher):
+    """Tabela de passos indexada pelo PC da carga.
+
+    Cada entrada guarda o último endereço, o passo e uma confiança; quando
+    o mesmo passo se repete `threshold` vezes, busca as linhas de
+    endereço + k * passo (k = 1..degree). A substituição é LRU.
+    """
+
+    name = "stride"
+
+    def __init__(self, degree: int = 2, table_size: int = 16, threshold: int = 2):
+        self.table_size = table_size
+        self.threshold = threshold
+        super().__init__(degree)
+
+    def reset(self, line_size: int):
+        super().reset(line_size)
+        # PC -> (último endereço, passo, confiança)
+        self.table: "OrderedDict[int, Tuple[int, int, int]]" = OrderedDict()
+
+    def observe(self, pc: int, address: int, line: int, hit: bool) -> List[int]:
+        entry = self.table.get(pc)
+        if entry is None:
+            self.table[pc] = (address, 0, 0)
+            if len(self.table) > self.table_size:
+                self.table.popitem(last=False)
+            return []
+        self.table.move_to_end(pc)
+        last_address, stride, confidence = entry
+        new_stride = address - last_address
+        if new_stride != 0 and new_stride == stride:
+            confidence = min(confidence + 1, self.threshold)
+        else:
+            confidence = 0
+        self.table[pc] = (address, new_stride, confidence)
+        if confidence < self.threshold:
+            return []
+        lines = []
+        for k in range(1, self.degree + 1):
+            target = (address + k * new_stride) // self.line_size
+            if target >= 0 and target != line and target not in lines:
+                lines.append(target)
+        return lines
+
+
+class StreamPrefetcher(Prefetcher):
+    """Detecta sequências de falhas em linhas consecutivas (em qualquer sentido).
+
+    Um fluxo nasce em uma falha; um acesso à linha vizinha confirma o
+    sentido e, a partir daí, cada acesso no fluxo adianta a busca em até
+    `degree` linhas, mantendo no máximo `distance` linhas à frente. Até `streams` fluxos são acompanhados, com substituição LRU.
+    """
+
+    name = "stream"
+
+    def __init__(self, degree: int = 2, streams: int = 4, distance: int = 4):
+        self.streams = streams
+        self.distance = distance
+        super().__init__(degree)
+
+    def reset(self, line_size: int):
+        super().reset(line_size)
+        # Identificador -> (última linha, sentido: +1, -1 ou 0 se não confirmado, última linha buscada)
+        self.table: "OrderedDict[int, Tuple[int, int, int]]" = OrderedDict()
+        self._next_id = 0
+
+    def observe(self, pc: int, address: int, line: int, hit: bool) -> List[int]:
+        for stream, (last, direction, frontier) in self.table.items():
+            delta = line - last
+            if direction == 0:
+                if delta not in (1, -1):
+                    continue
+                direction, frontier = delta, line
+            elif not 0 < delta * direction <= self.distance:
+                continue
+            # Avança a frente do fluxo em até `degree` linhas, até `distance` à frente
+            start = max((frontier - line) * direction, 0) + 1
+            end = min(start + self.degree, self.distance + 1)
+            lines = [line + direction * k for k in range(start, end)]
+            if lines:
+                frontier = lines[-1]
+            self.table[stream] = (line, direction, frontier)
+            self.table.move_to_end(stream)
+            return lines
+        if hit:
+            return []
+        self.table[self._next_id] = (line, 0, line)
+        self._next_id += 1
+        if len(self.table) > self.streams:
+            self.table.popitem(last=False)
+        return []
+
+
+PREFETCHERS = {
+    "next_line": NextLinePrefetcher,
+    "stride": StridePrefetcher,
+    "stream": StreamPrefetcher,
+}
+
+
+def create_prefetcher(name: Optional[str], **options) -> Optional[Prefetcher]:
+    """Instancia o prefetcher pelo nome (None ou "none" desativa)"""
+    if name is None or name == "none":
+        return None
+    if name not in PREFETCHERS:
+        raise ValueError(f"Prefetcher desconhecido: {name}")
+    return PREFETCHERS[name](**options)
+
+
+class PrefetchStats:
+    """Contadores de precisão, cobertura e pontualidade dos prefetches"""
+
+    def __init__(self):
+        self.issued = 0
+        self.dropped = 0  # Sem MSHR livre
+        self.useful = 0  # Linhas buscadas que uma carga usou
+        self.late = 0  # Usadas ainda a caminho (latência escondida só em parte)
+        self.demand_misses = 0  # Falhas de carga não cobertas
+        self.cycles_hidden = 0
+
+    def as_metrics(self) -> Dict[str, float]:
+        return {
+            "prefetches_issued": self.issued,
+            "prefetches_dropped": self.dropped,
+            "prefetches_useful": self.useful,
+            "prefetches_late": self.late,
+            "prefetch_accuracy": self.useful / self.issued if self.issued else 0,
+            "prefetch_coverage": (self.useful / (self.useful + self.demand_misses)
+                                  if self.useful + self.demand_misses else 0),
+            "prefetch_timeliness": (self.useful - self.late) / self.useful if self.useful else 0,
+            "prefetch_cycles_hidden": self.cycles_hidden
+        }
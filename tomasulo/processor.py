@@ -1,19 +1,54 @@
 # processor.py
 
-from typing import List, Optional, Dict
-from .instructions import Instruction, InstructionType, InstructionFactory
+import math
+from types import MappingProxyType
+from typing import Callable, Iterable, List, Optional, Dict
+from .instructions import (Instruction, InstructionType, InstructionFactory,
+                           ARITHMETIC_TYPES, LOAD_TYPES, STORE_TYPES, MEMORY_TYPES, VECTOR_TYPES,
+                           fp_divide)
+from . import vector
 from .reservation_station import ReservationStations
 from .register_status import RegisterStatus
-from .reorder_buffer import ReorderBuffer
+from .reorder_buffer import ReorderBuffer, ROBEntry
+from .analysis import DataflowBound, analyze
+from .cache import MemoryHierarchy
+from .reuse_buffer import ReuseBuffer
+from .fusion import FusionReport, fuse
+from .scheduler import ScheduleResult, schedule
+
+# Memória inicial padrão (somente leitura: cada processador recebe uma cópia)
+DEFAULT_MEMORY = MappingProxyType({0: 10, 4: 20})
+
 
 class TomasuloProcessor:
-    def __init__(self, latencies=None, n_add=3, n_mul=3, n_mem=2):
+    def __init__(self, latencies=None, n_add=3, n_mul=3, n_mem=2, n_fp_add=2, n_fp_mul=2,
+                 rob_size=8, memory_hierarchy: Optional[MemoryHierarchy] = None,
+                 reuse_buffer: Optional[ReuseBuffer] = None, fusion: Optional[Iterable[str]] = None,
+                 n_vector=1, vector_lanes=4, initial_memory: Optional[Dict[int, int]] = None,
+                 static_schedule: bool = False, rename_registers: bool = False):
         self.latencies = latencies or {}
-        self.reservation_stations = ReservationStations(n_add=n_add, n_mul=n_mul, n_mem=n_mem)
+        # Com hierarquia de cache, a latência de LD/ST depende do endereço
+        self.memory_hierarchy = memory_hierarchy
+        # Com buffer de reuso, operações repetidas terminam em um ciclo
+        self.reuse_buffer = reuse_buffer
+        # Regras de fusão de pares em macro-ops aplicadas ao carregar o programa
+        self.fusion_rules = tuple(fusion) if fusion else ()
+        self.fusion_report: Optional[FusionReport] = None
+        # Escalonamento estático (e renomeação) dos blocos básicos ao carregar o programa
+        self.static_schedule = static_schedule
+        self.rename_registers = rename_registers
+        self.schedule_result: Optional[ScheduleResult] = None
+        self.reservation_stations = ReservationStations(n_add=n_add, n_mul=n_mul, n_mem=n_mem,
+                                                        n_fp_add=n_fp_add, n_fp_mul=n_fp_mul,
+                                                        n_vector=n_vector)
+        # Elementos processados por ciclo em cada unidade vetorial
+        self.vector_lanes = vector_lanes
         self.register_status = RegisterStatus()
-        self.reorder_buffer = ReorderBuffer()
+        self.rob_size = rob_size
+        self.reorder_buffer = ReorderBuffer(rob_size)
         self.instructions: List[Instruction] = []
         self.current_instruction = 0
+        self.fetched = 0  # Tamanho do prefixo do programa já buscado (o estado só depende dele)
         self.cycle = 0
         self.metrics = {
             "total_instructions": 0,
@@ -21,58 +56,141 @@ class TomasuloProcessor:
             "bubble_cycles": 0,
             "committed_instructions": 0
         }
-        self.memory: Dict[int, int] = {}  # Memória simulada
+        # Conteúdo da memória restaurado a cada carga de programa
+        self.initial_memory: Dict[int, int] = dict(DEFAULT_MEMORY if initial_memory is None else initial_memory)
+        self.memory: Dict[int, int] = dict(self.initial_memory)  # Memória simulada
         self.is_finished = False
-        # Inicializa a memória com alguns valores para teste
-        self.memory[0] = 10
-        self.memory[4] = 20
         self.instruction_status = [] # Lista para rastrear o status de cada instrução
+        self.status_changes: List[int] = []  # Linhas de instruction_status alteradas, em ordem
+        self._status_rows: Dict[int, int] = {}  # id(instrução) -> linha em instruction_status
+        # Chamados a cada commit com a entrada do ROB (ex.: verificação contra o modelo funcional)
+        self.commit_listeners: List[Callable[[ROBEntry], None]] = []
+        self.dataflow_bound: Optional[DataflowBound] = None
+        self.stall_reason: Optional[str] = None  # Motivo da última falha de emissão
 
     def load_program(self, program: List[str]):
         """Carrega um programa MIPS"""
-        self.instructions = [InstructionFactory.create_instruction(instr, self.latencies) for instr in program]
+        self.load_instructions([InstructionFactory.create_instruction(instr, self.latencies) for instr in program])
+
+    def load_instructions(self, instructions: List[Instruction]):
+        """Carrega um programa já decodificado (pode ser compartilhado com outros modelos)"""
+        if self.static_schedule:
+            self.schedule_result = schedule(
+                instructions,
+                n_add=len(self.reservation_stations.add_stations),
+                n_mul=len(self.reservation_stations.mul_stations),
+                n_mem=len(self.reservation_stations.mem_stations),
+                n_fp_add=len(self.reservation_stations.fp_add_stations),
+                n_fp_mul=len(self.reservation_stations.fp_mul_stations),
+                n_vector=len(self.reservation_stations.vector_stations),
+                rename=self.rename_registers
+            )
+            instructions = self.schedule_result.instructions
+        self.instructions = instructions
         # Inicializa o status das instruções com todas as instruções do programa
         self.instruction_status = [{
             'instruction': str(instr),
             'issue': False,
             'execute': False,
             'write_result': False,
-            'commit': False
+            'commit': False,
+            'issue_cycle': None,
+            'execute_cycle': None,
+            'write_result_cycle': None,
+            'commit_cycle': None
         } for instr in self.instructions]
+        self.status_changes = []
+        self._status_rows = {id(instr): row for row, instr in enumerate(self.instructions)}
+        self.fusion_report = fuse(self.instructions, self.fusion_rules)
+        self._reset_pipeline()
+        # Limite de fluxo de dados calculado uma única vez por programa
+        self.dataflow_bound = analyze(
+            self.instructions,
+            n_add=len(self.reservation_stations.add_stations),
+            n_mul=len(self.reservation_stations.mul_stations),
+            n_mem=len(self.reservation_stations.mem_stations),
+            n_fp_add=len(self.reservation_stations.fp_add_stations),
+            n_fp_mul=len(self.reservation_stations.fp_mul_stations),
+            n_vector=len(self.reservation_stations.vector_stations),
+            rob_size=self.reorder_buffer.size,
+            latency_overrides=self._latency_overrides()
+        )
+        # O mesmo dicionário é mantido (a memória pode ser compartilhada entre núcleos)
+        self.memory.clear()
+        self.memory.update(self.initial_memory)
+
+    def _latency_overrides(self) -> Dict[InstructionType, int]:
+        """Menores latências possíveis quando cache ou reuso encurtam a execução"""
+        overrides = {}
+        if self.memory_hierarchy is not None:
+            for instruction_type in MEMORY_TYPES:
+                overrides[instruction_type] = self.memory_hierarchy.min_latency
+        if self.reuse_buffer is not None:
+            for instruction_type in self.reuse_buffer.types:
+                overrides[instruction_type] = 0
+        return overrides
+
+    def _reset_pipeline(self):
+        """Esvazia estações, ROB e registradores e zera ciclo e métricas"""
         self.current_instruction = 0
+        self.fetched = 0
         self.cycle = 0
         self.is_finished = False
+        self.stall_reason = None
         self.metrics = {
-            "total_instructions": len(program),
+            "total_instructions": len(self.instructions),
             "total_cycles": 0,
             "bubble_cycles": 0,
             "committed_instructions": 0
         }
+        self.fused_issued = 0
         # Limpa as estações de reserva e o buffer de reordenamento
         self.reservation_stations = ReservationStations(
             n_add=len(self.reservation_stations.add_stations),
             n_mul=len(self.reservation_stations.mul_stations),
-            n_mem=len(self.reservation_stations.mem_stations)
+            n_mem=len(self.reservation_stations.mem_stations),
+            n_fp_add=len(self.reservation_stations.fp_add_stations),
+            n_fp_mul=len(self.reservation_stations.fp_mul_stations),
+            n_vector=len(self.reservation_stations.vector_stations)
         )
         self.register_status = RegisterStatus()
-        self.reorder_buffer = ReorderBuffer()
-        self.memory[0] = 10
-        self.memory[4] = 20
+        self.reorder_buffer = ReorderBuffer(self.rob_size)
+        if self.memory_hierarchy is not None:
+            self.memory_hierarchy.reset()
+        if self.reuse_buffer is not None:
+            self.reuse_buffer.reset()
+
+    def warm_start(self, pc: int, registers: Dict[str, int], memory: Dict[int, int]):
+        """Continua o programa carregado a partir de um estado arquitetural
+        (pc, registradores e memória), com o pipeline vazio. Pode ser chamado
+        várias vezes sem recarregar o programa."""
+        self._reset_pipeline()
+        self.current_instruction = pc
+        for register, value in registers.items():
+            self.register_status.set_value(register, value)
+        self.memory.clear()
+        self.memory.update(memory)
 
     def issue(self) -> bool:
         """Tenta emitir uma nova instrução"""
+        self.stall_reason = None
         if self.current_instruction >= len(self.instructions):
+            self.stall_reason = "end_of_program"
             return False
 
         instruction = self.instructions[self.current_instruction]
-        
-        if self.current_instruction < len(self.instruction_status):
-            self.instruction_status[self.current_instruction]['issue'] = True
-        
-        # Tratamento para BEQ (sem ROB para simplificar)
+        # A busca inclui a instrução fundida, mesmo que a emissão pare
+        self.fetched = max(self.fetched, self.current_instruction + (2 if instruction.fused is not None else 1))
+
+        # Tratamento para BEQ (sem ROB para simplificar): resolvido na emissão,
+        # que espera os operandos ficarem prontos (no registrador ou no ROB)
         if instruction.type == InstructionType.BEQ:
-            r1_value = self.register_status.get_value(instruction.src1)
-            r2_value = self.register_status.get_value(instruction.src2)
+            r1_value, r1_tag = self._read_operand(instruction.src1)
+            r2_value, r2_tag = self._read_operand(instruction.src2)
+            if r1_tag is not None or r2_tag is not None:
+                self.stall_reason = "branch_operands"
+                return False
+            self._mark_stage(instruction, 'issue')
             if r1_value == r2_value:
                 self.current_instruction += 1 + (instruction.immediate or 0)
             else:
@@ -82,75 +200,111 @@ class TomasuloProcessor:
         
         # Verifica se há estação de reserva e ROB disponíveis
         station = self.reservation_stations.get_available_station(instruction)
-        if station is None or self.reorder_buffer.is_full():
+        if station is None:
+            self.stall_reason = "no_station"
+            return False
+        if self.reorder_buffer.is_full():
+            self.stall_reason = "rob_full"
             return False
+        # Instruções vetoriais leem VL na emissão: esperam um SETVL em andamento
+        if instruction.type in VECTOR_TYPES and not self.register_status.is_ready("VL"):
+            self.stall_reason = "vector_length"
+            return False
+        # O endereço é calculado na emissão: espera o registrador base
+        if instruction.type in MEMORY_TYPES and instruction.src1 and self._read_operand(instruction.src1)[1] is not None:
+            self.stall_reason = "address_operand"
+            return False
+
+        fused = instruction.fused
+        latency = instruction.latency
+        if self.memory_hierarchy is not None and instruction.type in MEMORY_TYPES:
+            latency = self.memory_hierarchy.access(
+                self._address(instruction), self.cycle,
+                is_write=instruction.type in STORE_TYPES,
+                # O PC das cargas treina o prefetcher da hierarquia
+                pc=self.current_instruction if instruction.type in LOAD_TYPES else None
+            )
+            if latency is None:
+                self.stall_reason = "mshr_full"
+                return False
+        if fused is not None:
+            # A macro-op executa a carga e, em seguida, a operação fundida
+            latency += fused.latency
+        vector_length = 0
+        if instruction.type in VECTOR_TYPES:
+            vector_length = self.register_status.get_value("VL")
+            latency = vector.occupancy(latency, vector_length, self.vector_lanes)
+
+        self._mark_stage(instruction, 'issue')
 
         # --- LÓGICA CORRIGIDA ---
 
         # Adiciona entrada no ROB e obtém o índice (nossa nova tag)
-        rob_index = self.reorder_buffer.add_entry(instruction, instruction.dest)
+        dest = fused.dest if fused is not None else instruction.dest
+        rob_index = self.reorder_buffer.add_entry(instruction, dest)
 
         # Configura a estação de reserva
         station.busy = True
         station.op = instruction.type
         station.instruction = instruction
-        station.remaining_cycles = instruction.latency + 1
+        station.latency = latency
+        station.remaining_cycles = latency + 1
+        station.vector_length = vector_length
         station.rob_index = rob_index  # Associa o índice do ROB à estação
 
         # Configura os operandos, buscando dependências no ROB
-        if instruction.type == InstructionType.LD:
-            base = self.register_status.get_value(instruction.src1) if instruction.src1 else 0
-            station.a = base + (instruction.immediate or 0)
+        if instruction.type in LOAD_TYPES:
+            station.a = self._address(instruction)
         
-        elif instruction.type == InstructionType.ST:
-            base = self.register_status.get_value(instruction.src1) if instruction.src1 else 0
-            station.a = base + (instruction.immediate or 0)
+        elif instruction.type in STORE_TYPES:
+            station.a = self._address(instruction)
             # Para ST, o valor a ser armazenado vem do registrador 'dest'
-            if self.register_status.is_ready(instruction.dest):
-                station.vj = self.register_status.get_value(instruction.dest)
-            else:
-                producer_rob_index = self.register_status.get_status(instruction.dest)
-                producer_entry = self.reorder_buffer.get_entry(producer_rob_index)
-                if producer_entry and producer_entry.ready:
-                    station.vj = producer_entry.value
-                else:
-                    station.qj = producer_rob_index
+            station.vj, station.qj = self._read_operand(instruction.dest)
 
         # Busca operandos para src1
-        if instruction.src1 and instruction.type not in [InstructionType.LD, InstructionType.ST]:
-            if self.register_status.is_ready(instruction.src1):
-                station.vj = self.register_status.get_value(instruction.src1)
-                station.qj = None
-            else:
-                producer_rob_index = self.register_status.get_status(instruction.src1)
-                producer_entry = self.reorder_buffer.get_entry(producer_rob_index)
-                if producer_entry and producer_entry.ready:
-                    station.vj = producer_entry.value
-                    station.qj = None
-                else:
-                    station.qj = producer_rob_index
+        if instruction.src1 and instruction.type not in MEMORY_TYPES:
+            station.vj, station.qj = self._read_operand(instruction.src1)
         
         # Busca operandos para src2
         if instruction.src2:
-            if self.register_status.is_ready(instruction.src2):
-                station.vk = self.register_status.get_value(instruction.src2)
-                station.qk = None
-            else:
-                producer_rob_index = self.register_status.get_status(instruction.src2)
-                producer_entry = self.reorder_buffer.get_entry(producer_rob_index)
-                if producer_entry and producer_entry.ready:
-                    station.vk = producer_entry.value
-                    station.qk = None
-                else:
-                    station.qk = producer_rob_index
+            station.vk, station.qk = self._read_operand(instruction.src2)
+
+        # Na macro-op, o operando da segunda instrução que não vem da carga vai em vk
+        if fused is not None:
+            other = fused.src2 if fused.src1 == instruction.dest else fused.src1
+            if other != instruction.dest:
+                station.vk, station.qk = self._read_operand(other)
 
         # Atualiza o status do registrador de destino com o índice do ROB
-        if instruction.dest and instruction.type != InstructionType.ST:
-            self.register_status.set_status(instruction.dest, rob_index)
+        if dest and instruction.type not in STORE_TYPES:
+            self.register_status.set_status(dest, rob_index)
 
-        self.current_instruction += 1
+        if fused is not None:
+            self.fused_issued += 1
+            self.current_instruction += 2
+        else:
+            self.current_instruction += 1
         return True
 
+    def _read_operand(self, register: str):
+        """Valor do registrador, ou a tag do ROB que o produzirá (valor, tag)"""
+        if self.register_status.is_ready(register):
+            return self.register_status.get_value(register), None
+        producer_rob_index = self.register_status.get_status(register)
+        producer_entry = self.reorder_buffer.get_entry(producer_rob_index)
+        if producer_entry and producer_entry.ready:
+            return producer_entry.value, None
+        return None, producer_rob_index
+
+    def _address(self, instruction: Instruction) -> int:
+        """Endereço efetivo de LD/ST: base (do registrador ou do ROB) + deslocamento"""
+        base = self._read_operand(instruction.src1)[0] if instruction.src1 else 0
+        # Um valor de ponto flutuante lido da memória pode servir de base
+        # NaN e infinito (ex.: DIV.D por zero) não formam endereço; usa-se 0
+        if isinstance(base, float) and not math.isfinite(base):
+            base = 0
+        return int(base) + (instruction.immediate or 0)
+
     def execute(self):
         avancou = False
         for name, station in self.reservation_stations.get_all_stations().items():
@@ -158,25 +312,19 @@ class TomasuloProcessor:
                 continue
 
             # Marca que a instrução está em execução
-            if station.remaining_cycles == station.instruction.latency:
-                for instr_status in self.instruction_status:
-                    if instr_status['instruction'] == str(station.instruction):
-                        instr_status['execute'] = True
-                        break
-            
-            # Marcar início da execução assim que a estação está pronta e ainda não foi marcada
-            if (
-                station.busy and
-                station.qj is None and
-                station.qk is None and
-                station.remaining_cycles == station.instruction.latency and
-                station.instruction is not None
-            ):
-                for instr_status in self.instruction_status:
-                    if instr_status['instruction'] == str(station.instruction):
-                        if not instr_status['execute']:
-                            instr_status['execute'] = True
-                        break
+            if station.remaining_cycles == station.latency:
+                self._mark_stage(station.instruction, 'execute')
+
+            # No primeiro ciclo com operandos prontos, consulta o buffer de reuso
+            if (self.reuse_buffer is not None and
+                    station.qj is None and station.qk is None and
+                    station.remaining_cycles == station.latency + 1 and
+                    self.reuse_buffer.applies(station.op) and
+                    self.reuse_buffer.lookup(station.op, station.vj, station.vk)):
+                self.reuse_buffer.cycles_saved += station.latency
+                station.remaining_cycles = 1
+                self._mark_stage(station.instruction, 'execute')
+
             # Agora sim decrementa o ciclo
             if station.qj is None and station.qk is None and station.remaining_cycles > 0:
                 station.remaining_cycles -= 1
@@ -184,6 +332,8 @@ class TomasuloProcessor:
             # Se a latência foi completada, executa a operação
             if station.remaining_cycles == 0 and station.qj is None and station.qk is None:
                 result = self._execute_operation(station)
+                if self.reuse_buffer is not None and self.reuse_buffer.applies(station.op):
+                    self.reuse_buffer.insert(station.op, station.vj, station.vk, result)
                 
                 # --- LÓGICA CORRIGIDA ---
                 # Propaga resultado usando o índice do ROB como tag
@@ -201,6 +351,8 @@ class TomasuloProcessor:
                 station.a = None
                 station.instruction = None
                 station.remaining_cycles = 0
+                station.latency = 0
+                station.vector_length = 0
                 station.rob_index = None
                 avancou = True
         return avancou
@@ -209,32 +361,80 @@ class TomasuloProcessor:
         """Executa a operação na estação de reserva"""
         result = 0
         try:
-            if station.op == InstructionType.ADD:
-                result = (station.vj or 0) + (station.vk or 0)
-            elif station.op == InstructionType.SUB:
-                result = (station.vj or 0) - (station.vk or 0)
-            elif station.op == InstructionType.MUL:
-                result = (station.vj or 0) * (station.vk or 0)
-            elif station.op == InstructionType.DIV:
-                vk = station.vk if station.vk is not None and station.vk != 0 else 1
-                result = (station.vj or 0) // vk
+            if station.op in VECTOR_TYPES:
+                result = self._vector_operation(station)
+            elif station.op == InstructionType.SETVL:
+                result = vector.clamp_length(station.vj)
+            elif station.op in ARITHMETIC_TYPES:
+                result = self._arithmetic(station.op, station.vj, station.vk)
             elif station.op == InstructionType.LD:
                 result = self.memory.get(station.a, 0)
-            elif station.op == InstructionType.ST:
+            elif station.op == InstructionType.L_D:
+                result = float(self.memory.get(station.a, 0))
+            elif station.op in STORE_TYPES:
                 if station.vj is not None:
                     self.memory[station.a] = station.vj
-                result = station.vj or 0 # ST não tem resultado para propagar, mas ROB precisa de um valor
+                result = station.vj if station.vj is not None else 0 # ST não tem resultado para propagar, mas ROB precisa de um valor
+
+            # Macro-op: aplica a operação fundida ao valor carregado
+            fused = station.instruction.fused if station.instruction else None
+            if fused is not None:
+                loaded = result
+                vj = loaded if fused.src1 == station.instruction.dest else station.vk
+                vk = loaded if fused.src2 == station.instruction.dest else station.vk
+                result = self._arithmetic(fused.type, vj, vk)
     
             # Marca que a instrução escreveu seu resultado
-            for instr_status in self.instruction_status:
-                if instr_status['instruction'] == str(station.instruction):
-                    instr_status['write_result'] = True
-                    break
+            self._mark_stage(station.instruction, 'write_result')
         except Exception as e:
             print(f"Erro ao executar operação: {e}")
             result = 0
         return result
 
+    def _vector_operation(self, station):
+        """Executa a instrução vetorial inteira de uma vez com NumPy"""
+        length = station.vector_length
+        if station.op == InstructionType.VLD:
+            return vector.load(self.memory, station.a, length)
+        if station.op == InstructionType.VST:
+            vector.store(self.memory, station.a, station.vj, length)
+            return vector.fit(station.vj, length)
+        if station.op == InstructionType.VADD:
+            return vector.add(station.vj, station.vk, length)
+        return vector.multiply(station.vj, station.vk, length)
+
+    @staticmethod
+    def _arithmetic(op: InstructionType, vj, vk):
+        if op == InstructionType.ADD:
+            return (vj or 0) + (vk or 0)
+        if op == InstructionType.SUB:
+            return (vj or 0) - (vk or 0)
+        if op == InstructionType.MUL:
+            return (vj or 0) * (vk or 0)
+        if op == InstructionType.DIV:
+            return (vj or 0) // (vk if vk is not None and vk != 0 else 1)
+        if op == InstructionType.ADD_D:
+            return float(vj or 0) + float(vk or 0)
+        if op == InstructionType.SUB_D:
+            return float(vj or 0) - float(vk or 0)
+        if op == InstructionType.MUL_D:
+            return float(vj or 0) * float(vk or 0)
+        return fp_divide(float(vj or 0), float(vk or 0))
+
+    def _mark_stage(self, instruction: Instruction, stage: str):
+        """Marca o estágio da instrução e registra o ciclo em que foi atingido"""
+        row = self._status_rows.get(id(instruction))
+        if row is None:
+            return
+        instr_status = self.instruction_status[row]
+        if not instr_status[stage]:
+            instr_status[stage] = True
+            instr_status[f'{stage}_cycle'] = self.cycle
+            self.status_changes.append(row)
+        # A instrução fundida avança junto com a macro-op
+        if instruction.fused is not None:
+            self._mark_stage(instruction.fused, stage)
+
     def commit(self):
         """Tenta fazer commit de uma instrução"""
         if self.reorder_buffer.is_empty():
@@ -246,25 +446,26 @@ class TomasuloProcessor:
 
         if entry:
             # Marca que a instrução foi commitada
-            for instr_status in self.instruction_status:
-                if instr_status['instruction'] == str(entry.instruction):
-                    instr_status['commit'] = True
-                    break
+            self._mark_stage(entry.instruction, 'commit')
             
             # Para ST, o valor já foi escrito na memória na fase de execução,
             # aqui apenas confirmamos. Para outros, escrevemos no registrador.
-            if entry.instruction.type != InstructionType.ST and entry.destination and entry.value is not None:
+            if entry.instruction.type not in STORE_TYPES and entry.destination and entry.value is not None:
                  # Faz o commit no registrador, passando o índice do ROB para a verificação
                 self.register_status.update_on_commit(entry.destination, entry.value, committing_index)
 
-            self.metrics["committed_instructions"] += 1
+            self.metrics["committed_instructions"] += 2 if entry.instruction.fused is not None else 1
+            for listener in self.commit_listeners:
+                listener(entry)
             return True
         return False
 
     def is_program_finished(self) -> bool:
         """Verifica se o programa terminou"""
-        # A condição final é quando todas as instruções foram commitadas
-        return self.metrics["committed_instructions"] == self.metrics["total_instructions"]
+        # Termina quando não há mais o que emitir e o ROB esvaziou. Contar os
+        # commits não basta: um desvio tomado pula instruções e um laço
+        # (deslocamento negativo) executa algumas mais de uma vez
+        return self.current_instruction >= len(self.instructions) and self.reorder_buffer.is_empty()
 
     def step(self) -> bool:
         """Executa um ciclo do processador"""
@@ -278,6 +479,7 @@ class TomasuloProcessor:
         committed = self.commit()
         executed = self.execute()
         issued = self.issue()
+        self.reorder_buffer.sample_occupancy()
 
         # Uma bolha ocorre quando nada progride e o programa não terminou
         if not (issued or executed or committed) and not self.is_program_finished():
@@ -289,10 +491,27 @@ class TomasuloProcessor:
 
     def get_metrics(self) -> Dict:
         """Retorna as métricas de desempenho"""
-        return {
+        metrics = {
             **self.metrics,
             "ipc": self.metrics["committed_instructions"] / self.metrics["total_cycles"] if self.metrics["total_cycles"] > 0 else 0
         }
+        # Com desvios o caminho executado não é conhecido: o valor não é um limite
+        if self.dataflow_bound is not None and not self.dataflow_bound.has_branches:
+            metrics["dataflow_bound_cycles"] = self.dataflow_bound.lower_bound_cycles
+            metrics["dataflow_efficiency"] = self.dataflow_bound.efficiency(self.metrics["total_cycles"])
+        metrics.update(self.reorder_buffer.occupancy_stats())
+        if self.memory_hierarchy is not None:
+            metrics.update(self.memory_hierarchy.stats())
+        if self.reuse_buffer is not None:
+            metrics.update(self.reuse_buffer.stats())
+        if self.schedule_result is not None:
+            metrics.update(self.schedule_result.as_metrics())
+        if self.fusion_rules and self.fusion_report is not None:
+            metrics.update(self.fusion_report.as_metrics())
+            committed = self.metrics["committed_instructions"]
+            metrics["fused_issued"] = self.fused_issued
+            metrics["dynamic_fusion_rate"] = 2 * self.fused_issued / committed if committed else 0
+        return metrics
 
     def get_state(self) -> Dict:
         """Retorna o estado atual do processador"""
@@ -317,7 +536,7 @@ class TomasuloProcessor:
             "instruction_status": self.instruction_status,
             "reorder_buffer": [
                 {
-                    "instruction": str(entry.instruction) if entry else None,
+                    "instruction": entry.instruction.macro_op if entry else None,
                     "state": entry.state if entry else None,
                     "destination": entry.destination if entry else None,
                     "value": entry.value if entry else None,
@@ -0,0 +1,145 @@
+# profiler.py
+
+from time import perf_counter_ns
+from typing import Dict, List
+
+# Fases cronometradas dentro de step() (update_stations é chamada por execute)
+STEP_PHASES = ("commit", "execute", "issue", "update_stations")
+PHASES = STEP_PHASES + ("get_state",)
+
+
+class PhaseProfiler:
+    """Mede o tempo de host gasto em cada fase do simulador.
+
+    attach() envolve os métodos do processador na própria instância (a
+    classe não muda e, sem profiler, não há custo algum). O tempo de cada
+    step() é sempre medido; as fases só nos ciclos amostrados (um a cada
+    `sample_every`), e os totais são extrapolados para todos os ciclos.
+    Os tempos são inclusivos: o de execute contém o de update_stations.
+    """
+
+    def __init__(self, processor, sample_every: int = 1):
+        if sample_every < 1:
+            raise ValueError("sample_every deve ser positivo")
+        self.processor = processor
+        self.sample_every = sample_every
+        self._stations = None
+        self._attached = False
+        self.reset()
+
+    def reset(self):
+        self.totals: Dict[str, int] = {phase: 0 for phase in PHASES}
+        self.calls: Dict[str, int] = {phase: 0 for phase in PHASES}
+        self.cycles = 0
+        self.step_ns = 0
+        self.sampled_cycles = 0
+        self.sampled_step_ns = 0
+        self._sampling = False
+
+    def _timed(self, phase: str, method, always: bool = False):
+        totals, calls = self.totals, self.calls
+
+        def timed(*args, **kwargs):
+            if not (always or self._sampling):
+                return method(*args, **kwargs)
+            start = perf_counter_ns()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                totals[phase] += perf_counter_ns() - start
+                calls[phase] += 1
+        return timed
+
+    def _wrap_stations(self):
+        # As estações são recriadas quando o pipeline é reiniciado
+        stations = self.processor.reservation_stations
+        if stations is not self._stations:
+            stations.update_stations = self._timed("update_stations", stations.update_stations)
+            self._stations = stations
+
+    def _step(self, method):
+        processor = self.processor
+
+        def step():
+            self._wrap_stations()
+            self._sampling = self.cycles % self.sample_every == 0
+            cycle = processor.cycle
+            start = perf_counter_ns()
+            running = method()
+            elapsed = perf_counter_ns() - start
+            if processor.cycle != cycle:
+                self.cycles += 1
+                self.step_ns += elapsed
+                if self._sampling:
+                    self.sampled_cycles += 1
+                    self.sampled_step_ns += elapsed
+            self._sampling = False
+            return running
+        return step
+
+    def attach(self) -> "PhaseProfiler":
+        if self._attached:
+            return self
+        processor = self.processor
+        for phase in ("commit", "execute", "issue"):
+            setattr(processor, phase, self._timed(phase, getattr(processor, phase)))
+        processor.get_state = self._timed("get_state", processor.get_state, always=True)
+        processor.step = self._step(processor.step)
+        self._attached = True
+        return self
+
+    def detach(self):
+        """Remove os envoltórios, restaurando os métodos da classe"""
+        if not self._attached:
+            return
+        for name in ("commit", "execute", "issue", "get_state", "step"):
+            self.processor.__dict__.pop(name, None)
+        if self._stations is not None:
+            self._stations.__dict__.pop("update_stations", None)
+            self._stations = None
+        self._attached = False
+
+    def cycles_per_second(self) -> float:
+        return self.cycles * 1e9 / self.step_ns if self.step_ns else 0
+
+    def _estimated_ns(self, phase: str) -> float:
+        """Tempo total da fase extrapolado para todos os ciclos"""
+        if phase not in STEP_PHASES:
+            return self.totals[phase]
+        if not self.sampled_cycles:
+            return 0
+        return self.totals[phase] * self.cycles / self.sampled_cycles
+
+    def top_phases(self, count: int = 3) -> List[str]:
+        """Fases com maior tempo total, da mais cara para a mais barata"""
+        ranked = sorted(PHASES, key=self._estimated_ns, reverse=True)
+        return [phase for phase in ranked if self.calls[phase]][:count]
+
+    def report(self) -> Dict:
+        phases = {}
+        for phase in PHASES:
+            calls = self.calls[phase]
+            phases[phase] = {
+                "calls": calls,
+                "ns_per_call": self.totals[phase] / calls if calls else 0,
+                "estimated_ms": self._estimated_ns(phase) / 1e6,
+            }
+            if phase in STEP_PHASES:
+                phases[phase]["step_share"] = (self.totals[phase] / self.sampled_step_ns
+                                               if self.sampled_step_ns else 0)
+        return {
+            "cycles": self.cycles,
+            "sampled_cycles": self.sampled_cycles,
+            "host_seconds": self.step_ns / 1e9,
+            "cycles_per_second": self.cycles_per_second(),
+            "phases": phases,
+            "top_phases": self.top_phases()
+        }
+
+    def summary(self) -> str:
+        """Resumo de uma linha para a barra de status"""
+        shares = []
+        for phase in self.top_phases():
+            if phase in STEP_PHASES and self.sampled_step_ns:
+                shares.append(f"{phase} {100 * self.totals[phase] / self.sampled_step_ns:.0f}%")
+        return f"{self.cycles_per_second():,.0f} ciclos/s | " + " · ".join(shares)
@@ -0,0 +1,136 @@
+# recorder.py
+
+import os
+from typing import Dict, Iterable, Optional
+import numpy as np
+
+# Motivos de parada da emissão, na ordem dos códigos gravados
+STALL_REASONS = ("none", "end_of_program", "no_station", "rob_full", "mshr_full", "vector_length",
+                 "branch_operands", "address_operand")
+
+SIGNALS = ("station_busy", "rob_occupancy", "register_status", "committed", "stall_reason")
+
+
+class StateRecorder:
+    """Grava sinais escolhidos de cada ciclo em arrays NumPy pré-alocados.
+
+    Substitui os dicionários de get_state() quando o objetivo é análise
+    offline: cada sinal vira uma coluna com uma linha por ciclo.
+      - station_busy: (ciclos, estações) bool
+      - rob_occupancy: (ciclos,) entradas ocupadas no ROB
+      - register_status: (ciclos, registradores) índice do ROB produtor, -1 se pronto
+      - committed: (ciclos,) instruções commitadas até o ciclo
+      - stall_reason: (ciclos,) código em STALL_REASONS
+    """
+
+    def __init__(self, processor, signals: Optional[Iterable[str]] = None, capacity: int = 1024):
+        self.processor = processor
+        self.signals = tuple(signals) if signals is not None else SIGNALS
+        unknown = set(self.signals) - set(SIGNALS)
+        if unknown:
+            raise ValueError(f"Sinais desconhecidos: {sorted(unknown)}")
+        self.station_names = list(processor.reservation_stations.get_all_stations().keys())
+        self.register_names = list(processor.register_status.status.keys())
+        self.length = 0
+        self.cycles = np.zeros(capacity, dtype=np.int64)
+        self.columns: Dict[str, np.ndarray] = {
+            name: np.zeros(self._shape(name, capacity), dtype=self._dtype(name))
+            for name in self.signals
+        }
+
+    def _shape(self, name: str, rows: int):
+        if name == "station_busy":
+            return (rows, len(self.station_names))
+        if name == "register_status":
+            return (rows, len(self.register_names))
+        return (rows,)
+
+    @staticmethod
+    def _dtype(name: str):
+        if name == "station_busy":
+            return np.bool_
+        if name == "stall_reason":
+            return np.uint8
+        if name == "register_status":
+            return np.int32
+        return np.int64
+
+    def _grow(self):
+        """Dobra a capacidade dos arrays quando ficam cheios"""
+        capacity = 2 * len(self.cycles)
+        self.cycles = np.resize(self.cycles, capacity)
+        for name, column in self.columns.items():
+            grown = np.zeros(self._shape(name, capacity), dtype=column.dtype)
+            grown[:self.length] = column[:self.length]
+            self.columns[name] = grown
+
+    def record(self):
+        """Grava o estado atual do processador como uma nova linha"""
+        if self.length == len(self.cycles):
+            self._grow()
+        row = self.length
+        processor = self.processor
+        self.cycles[row] = processor.cycle
+        columns = self.columns
+
+        if "station_busy" in columns:
+            busy = columns["station_busy"][row]
+            for i, station in enumerate(processor.reservation_stations.get_all_stations().values()):
+                busy[i] = station.busy
+        if "rob_occupancy" in columns:
+            columns["rob_occupancy"][row] = processor.reorder_buffer.count
+        if "register_status" in columns:
+            status = processor.register_status.status
+            columns["register_status"][row] = [
+                -1 if status[reg] is None else status[reg] for reg in self.register_names
+            ]
+        if "committed" in columns:
+            columns["committed"][row] = processor.metrics["committed_instructions"]
+        if "stall_reason" in columns:
+            columns["stall_reason"][row] = STALL_REASONS.index(processor.stall_reason or "none")
+        self.length += 1
+
+    def step(self) -> bool:
+        """Avança um ciclo do processador e grava o estado resultante"""
+        running = self.processor.step()
+        self.record()
+        return running
+
+    def run(self, max_cycles: int = 1_000_000) -> int:
+        """Simula até o fim (ou max_cycles) gravando todos os ciclos"""
+        while self.processor.cycle < max_cycles and self.step():
+            pass
+        return self.length
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        """Retorna as colunas gravadas (visões sem cópia) e os metadados"""
+        result = {name: column[:self.length] for name, column in self.columns.items()}
+        result["cycle"] = self.cycles[:self.length]
+        result["station_names"] = np.array(self.station_names)
+        result["register_names"] = np.array(self.register_names)
+        result["stall_reasons"] = np.array(STALL_REASONS)
+        return result
+
+    def save(self, path: str, compressed: bool = False):
+        """Salva em um arquivo .npz ou, se path não terminar em .npz, em um
+        diretório com um .npy por sinal, que pode ser aberto com mmap"""
+        arrays = self.arrays()
+        if path.endswith(".npz"):
+            (np.savez_compressed if compressed else np.savez)(path, **arrays)
+            return
+        os.makedirs(path, exist_ok=True)
+        for name, array in arrays.items():
+            np.save(os.path.join(path, f"{name}.npy"), array)
+
+
+def load_recording(path: str, mmap: bool = True) -> Dict[str, np.ndarray]:
+    """Carrega uma gravação salva por StateRecorder.save sem re-simular"""
+    if path.endswith(".npz"):
+        with np.load(path) as data:
+            return {name: data[name] for name in data.files}
+    mmap_mode = "r" if mmap else None
+    return {
+        entry[:-4]: np.load(os.path.join(path, entry), mmap_mode=mmap_mode)
+        for entry in sorted(os.listdir(path))
+        if entry.endswith(".npy")
+    }
@@ -1,16 +1,18 @@
 from typing import Dict, Optional
+from .vector import MAX_VECTOR_LENGTH, VECTOR_REGISTERS, empty_vector
 
 class RegisterStatus:
     def __init__(self):
         # Registradores MIPS (R0-R31 e F0-F31)
         self.registers: Dict[str, int] = {f"R{i}": 0 for i in range(32)}
-        self.registers.update({f"F{i}": 0 for i in range(32)})
+        self.registers.update({f"F{i}": 0.0 for i in range(32)})
+        # Registradores vetoriais (arrays NumPy) e o comprimento vetorial
+        self.registers.update({reg: empty_vector() for reg in VECTOR_REGISTERS})
+        self.registers["VL"] = MAX_VECTOR_LENGTH
  
-        self.status: Dict[str, Optional[int]] = {f"R{i}": None for i in range(32)}
-        self.status.update({f"F{i}": None for i in range(32)})
+        self.status: Dict[str, Optional[int]] = {reg: None for reg in self.registers}
         
-        self.values: Dict[str, int] = {f"R{i}": 0 for i in range(32)}
-        self.values.update({f"F{i}": 0 for i in range(32)})
+        self.values: Dict[str, int] = dict(self.registers)
 
     def get_value(self, register: str) -> int:
         """Retorna o valor atual do registrador"""
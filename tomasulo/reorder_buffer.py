@@ -10,15 +10,30 @@ class ROBEntry:
     value: Optional[int] = None
     ready: bool = False
     branch_mispredicted: bool = False
-    speculative: bool = False  
+    speculative: bool = False
 
 class ReorderBuffer:
+    """Buffer circular de tamanho configurável.
+
+    Todas as operações usadas a cada ciclo (emissão, busca do produtor,
+    atualização, commit e flush) são O(1), independentemente do tamanho.
+    Entradas fora da janela [head, head + count) são consideradas vazias,
+    o que permite descartar entradas no flush apenas movendo o tail.
+    """
+
     def __init__(self, size: int = 8):
+        if size < 1:
+            raise ValueError("O ROB precisa de pelo menos uma entrada")
         self.size = size
         self.entries: List[Optional[ROBEntry]] = [None] * size
         self.head = 0
         self.tail = 0
         self.count = 0
+        # Estatísticas de ocupação, amostradas uma vez por ciclo
+        self.samples = 0
+        self.occupancy_sum = 0
+        self.max_occupancy = 0
+        self.full_cycles = 0
 
     def is_full(self) -> bool:
         return self.count == self.size
@@ -26,6 +41,9 @@ class ReorderBuffer:
     def is_empty(self) -> bool:
         return self.count == 0
 
+    def _is_live(self, index: int) -> bool:
+        return 0 <= index < self.size and (index - self.head) % self.size < self.count
+
     def add_entry(self, instruction: Instruction, destination: Optional[str] = None, speculative: bool = False) -> int:
         if self.is_full():
             raise Exception("Buffer de reordenamento cheio")
@@ -52,27 +70,44 @@ class ReorderBuffer:
         return entry
 
     def update_entry(self, index: int, value: int):
-        if 0 <= index < self.size and self.entries[index] is not None:
+        if self._is_live(index) and self.entries[index] is not None:
             self.entries[index].value = value
             self.entries[index].ready = True
             self.entries[index].state = "WRITE_RESULT"
 
     def mark_mispredicted(self, index: int):
-        if 0 <= index < self.size and self.entries[index] is not None:
+        if self._is_live(index) and self.entries[index] is not None:
             self.entries[index].branch_mispredicted = True
 
     def flush_after(self, index: int):
-        current = (index + 1) % self.size
-        while current != self.tail:
-            self.entries[current] = None
-            current = (current + 1) % self.size
+        """Descarta as entradas mais novas que `index` (O(1): as posições
+        liberadas saem da janela e são sobrescritas por novas emissões)"""
+        if not self._is_live(index):
+            return
+        self.count = (index - self.head) % self.size + 1
         self.tail = (index + 1) % self.size
-        self.count = (self.tail - self.head) % self.size
 
     def get_entry(self, index: int) -> Optional[ROBEntry]:
-        if 0 <= index < self.size:
+        if self._is_live(index):
             return self.entries[index]
         return None
 
+    def sample_occupancy(self):
+        """Registra a ocupação do ciclo atual"""
+        self.samples += 1
+        self.occupancy_sum += self.count
+        if self.count > self.max_occupancy:
+            self.max_occupancy = self.count
+        if self.count == self.size:
+            self.full_cycles += 1
+
+    def occupancy_stats(self) -> dict:
+        return {
+            "rob_size": self.size,
+            "rob_avg_occupancy": self.occupancy_sum / self.samples if self.samples else 0,
+            "rob_max_occupancy": self.max_occupancy,
+            "rob_full_cycles": self.full_cycles
+        }
+
     def get_all_entries(self) -> List[Optional[ROBEntry]]:
-        return self.entries
\ No newline at end of file
+        return [entry if self._is_live(index) else None for index, entry in enumerate(self.entries)]
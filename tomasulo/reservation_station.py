@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 from typing import Optional, Dict
-from .instructions import Instruction, InstructionType
+from .instructions import Instruction, InstructionType, VECTOR_TYPES
 
 @dataclass
 class ReservationStation:
@@ -17,32 +17,47 @@ class ReservationStation:
     a: Optional[int] = None
     instruction: Optional[Instruction] = None
     remaining_cycles: int = 0
+    latency: int = 0  # Latência desta execução (LD/ST variam com a cache)
+    vector_length: int = 0  # VL capturado na emissão de instruções vetoriais
     rob_index: Optional[int] = None
 
 class ReservationStations:
-    def __init__(self, n_add=3, n_mul=3, n_mem=2):
-        # ... (nenhuma mudança no __init__)
+    def __init__(self, n_add=3, n_mul=3, n_mem=2, n_fp_add=2, n_fp_mul=2, n_vector=1):
         self.add_stations: Dict[str, ReservationStation] = { f"Add{i}": ReservationStation(f"Add{i}") for i in range(n_add) }
         self.mul_stations: Dict[str, ReservationStation] = { f"Mul{i}": ReservationStation(f"Mul{i}") for i in range(n_mul) }
         self.mem_stations: Dict[str, ReservationStation] = { f"Mem{i}": ReservationStation(f"Mem{i}") for i in range(n_mem) }
+        # Unidades de ponto flutuante separadas das inteiras; L.D/S.D usam as estações de memória
+        self.fp_add_stations: Dict[str, ReservationStation] = { f"FAdd{i}": ReservationStation(f"FAdd{i}") for i in range(n_fp_add) }
+        self.fp_mul_stations: Dict[str, ReservationStation] = { f"FMul{i}": ReservationStation(f"FMul{i}") for i in range(n_fp_mul) }
+        # Unidades vetoriais: VLD, VST, VADD e VMUL
+        self.vector_stations: Dict[str, ReservationStation] = { f"Vec{i}": ReservationStation(f"Vec{i}") for i in range(n_vector) }
 
     def get_available_station(self, instruction: Instruction) -> Optional[ReservationStation]:
-        # ... (nenhuma mudança aqui)
-        if instruction.type in [InstructionType.ADD, InstructionType.SUB]:
+        if instruction.type in [InstructionType.ADD, InstructionType.SUB, InstructionType.SETVL]:
             for station in self.add_stations.values():
                 if not station.busy: return station
         elif instruction.type in [InstructionType.MUL, InstructionType.DIV]:
             for station in self.mul_stations.values():
                 if not station.busy: return station
-        elif instruction.type in [InstructionType.LD, InstructionType.ST]:
+        elif instruction.type in [InstructionType.LD, InstructionType.ST, InstructionType.L_D, InstructionType.S_D]:
             for station in self.mem_stations.values():
                 if not station.busy: return station
+        elif instruction.type in [InstructionType.ADD_D, InstructionType.SUB_D]:
+            for station in self.fp_add_stations.values():
+                if not station.busy: return station
+        elif instruction.type in [InstructionType.MUL_D, InstructionType.DIV_D]:
+            for station in self.fp_mul_stations.values():
+                if not station.busy: return station
+        elif instruction.type in VECTOR_TYPES:
+            for station in self.vector_stations.values():
+                if not station.busy: return station
         return None
 
     # --- ALTERADO ---
     def update_stations(self, rob_index: int, value: int):
         """Atualiza as estações de reserva usando o índice do ROB como tag."""
-        for stations in [self.add_stations, self.mul_stations, self.mem_stations]:
+        for stations in [self.add_stations, self.mul_stations, self.mem_stations,
+                         self.fp_add_stations, self.fp_mul_stations, self.vector_stations]:
             for station in stations.values():
                 if station.qj == rob_index:
                     station.vj = value
@@ -64,5 +79,8 @@ class ReservationStations:
         return {
             **self.add_stations,
             **self.mul_stations,
-            **self.mem_stations
+            **self.mem_stations,
+            **self.fp_add_stations,
+            **self.fp_mul_stations,
+            **self.vector_stations
         } 
\ No newline at end of file
@@ -0,0 +1,66 @@
+# reuse_buffer.py
+
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+from .instructions import InstructionType
+
+DEFAULT_REUSE_TYPES = (InstructionType.MUL, InstructionType.DIV, InstructionType.MUL_D, InstructionType.DIV_D)
+
+
+class ReuseBuffer:
+    """Memoização de resultados no estágio de execução.
+
+    Guarda as últimas tuplas (operação, vj, vk) executadas. Quando uma
+    instrução elegível fica pronta com operandos já vistos, ela termina no
+    mesmo ciclo em vez de ocupar a unidade por toda a latência. A substituição
+    é LRU.
+    """
+
+    def __init__(self, capacity: int = 64, types: Iterable[InstructionType] = DEFAULT_REUSE_TYPES):
+        if capacity < 1:
+            raise ValueError("A capacidade do buffer de reuso deve ser positiva")
+        self.capacity = capacity
+        self.types = frozenset(types)
+        self.reset()
+
+    def reset(self):
+        self.entries: "OrderedDict[Tuple, object]" = OrderedDict()
+        self.lookups = 0
+        self.hits = 0
+        self.evictions = 0
+        self.cycles_saved = 0
+
+    def applies(self, op: Optional[InstructionType]) -> bool:
+        return op in self.types
+
+    @staticmethod
+    def _key(op: InstructionType, vj, vk) -> Tuple:
+        # O tipo distingue 2 de 2.0 e -0.0 de 0.0 (que são iguais como chaves)
+        return (op, type(vj), vj, str(vj), type(vk), vk, str(vk))
+
+    def lookup(self, op: InstructionType, vj, vk) -> bool:
+        """Indica se o resultado de (op, vj, vk) está memoizado"""
+        self.lookups += 1
+        key = self._key(op, vj, vk)
+        if key not in self.entries:
+            return False
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return True
+
+    def insert(self, op: InstructionType, vj, vk, result):
+        key = self._key(op, vj, vk)
+        self.entries[key] = result
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "reuse_lookups": self.lookups,
+            "reuse_hits": self.hits,
+            "reuse_hit_rate": self.hits / self.lookups if self.lookups else 0,
+            "reuse_evictions": self.evictions,
+            "reuse_cycles_saved": self.cycles_saved
+        }
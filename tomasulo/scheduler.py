@@ -0,0 +1,227 @@
+# scheduler.py
+
+from dataclasses import dataclass, replace
+from typing import Dict, List, Optional, Tuple
+from .instructions import Instruction, MEMORY_TYPES, STORE_TYPES, source_registers
+from .analysis import STATION_CLASS, CONTROL_TYPES
+from .fusion import branch_targets
+
+# Bancos de registradores que podem receber nomes novos (V e VL não são renomeados)
+RENAMABLE_FILES = ("R", "F")
+
+
+@dataclass
+class ScheduleResult:
+    """Programa reordenado pela passagem de escalonamento"""
+    instructions: List[Instruction]
+    blocks: int = 0
+    moved: int = 0  # Instruções que mudaram de posição
+    renamed: int = 0  # Definições que receberam um registrador novo
+
+    @property
+    def program(self) -> List[str]:
+        return [str(instruction) for instruction in self.instructions]
+
+    def as_metrics(self) -> Dict[str, int]:
+        return {
+            "scheduled_blocks": self.blocks,
+            "scheduled_moved": self.moved,
+            "scheduled_renamed": self.renamed
+        }
+
+
+@dataclass
+class ScheduleReport:
+    """Ciclos e IPC do programa original e do escalonado no mesmo processador"""
+    before: Dict
+    after: Dict
+    schedule: ScheduleResult
+
+    @property
+    def speedup(self) -> float:
+        return self.before["total_cycles"] / self.after["total_cycles"] if self.after["total_cycles"] else 0
+
+    @property
+    def recovered_bubble_cycles(self) -> int:
+        """Ciclos de bolha eliminados em software"""
+        return self.before["bubble_cycles"] - self.after["bubble_cycles"]
+
+    def as_dict(self) -> Dict:
+        keys = ("total_cycles", "ipc", "bubble_cycles", "committed_instructions")
+        return {
+            "before": {key: self.before[key] for key in keys},
+            "after": {key: self.after[key] for key in keys},
+            "speedup": self.speedup,
+            "recovered_bubble_cycles": self.recovered_bubble_cycles,
+            **self.schedule.as_metrics(),
+            "program": self.schedule.program
+        }
+
+
+def _writes(instruction: Instruction) -> Optional[str]:
+    if instruction.type in STORE_TYPES or instruction.type in CONTROL_TYPES:
+        return None
+    return instruction.dest
+
+
+def basic_blocks(instructions: List[Instruction]) -> List[Tuple[int, int]]:
+    """Intervalos [início, fim) sem desvios no meio nem alvos de desvio após o início"""
+    leaders = {0} | {target for target in branch_targets(instructions) if 0 <= target < len(instructions)}
+    for index, instruction in enumerate(instructions):
+        if instruction.type in CONTROL_TYPES:
+            leaders.add(index + 1)
+    starts = sorted(leader for leader in leaders if leader < len(instructions))
+    return list(zip(starts, starts[1:] + [len(instructions)]))
+
+
+def _rename_uses(instruction: Instruction, old: str, new: str) -> Instruction:
+    changes = {}
+    if instruction.src1 == old:
+        changes["src1"] = new
+    if instruction.src2 == old:
+        changes["src2"] = new
+    if instruction.type in STORE_TYPES and instruction.dest == old:
+        changes["dest"] = new
+    return replace(instruction, **changes) if changes else instruction
+
+
+def _free_registers(instructions: List[Instruction]) -> Dict[str, List[str]]:
+    """Registradores R e F que o programa não usa (R0 nunca é usado como novo nome)"""
+    used = set()
+    for instruction in instructions:
+        used.update(source_registers(instruction))
+        if instruction.dest:
+            used.add(instruction.dest)
+    return {
+        prefix: [f"{prefix}{i}" for i in range(1 if prefix == "R" else 0, 32) if f"{prefix}{i}" not in used]
+        for prefix in RENAMABLE_FILES
+    }
+
+
+def rename_block(block: List[Instruction], free: Dict[str, List[str]]) -> Tuple[List[Instruction], int]:
+    """Renomeia as definições redefinidas dentro do próprio bloco.
+
+    Um valor sobrescrito antes do fim do bloco não é visto por nenhuma
+    outra instrução, então ele e suas leituras podem usar um registrador
+    livre, eliminando as dependências falsas (WAR e WAW) com a redefinição.
+    Os registradores livres terminam a execução com valores de rascunho.
+    """
+    block = list(block)
+    available = {prefix: list(registers) for prefix, registers in free.items()}
+    renamed = 0
+    for index, instruction in enumerate(block):
+        register = _writes(instruction)
+        if register is None or register[0] not in available or not available[register[0]]:
+            continue
+        redefinition = next((later for later in range(index + 1, len(block))
+                             if _writes(block[later]) == register), None)
+        if redefinition is None:
+            continue  # Vivo na saída do bloco
+        new = available[register[0]].pop(0)
+        block[index] = replace(instruction, dest=new)
+        # As leituras até a redefinição (inclusive) passam a usar o novo nome
+        for later in range(index + 1, redefinition + 1):
+            block[later] = _rename_uses(block[later], register, new)
+        renamed += 1
+    return block, renamed
+
+
+def _dependences(block: List[Instruction]) -> List[List[Tuple[int, bool]]]:
+    """Predecessores de cada instrução: (índice, se espera o resultado)"""
+    predecessors: List[List[Tuple[int, bool]]] = []
+    for index, instruction in enumerate(block):
+        reads = set(source_registers(instruction))
+        writes = _writes(instruction)
+        edges = []
+        for earlier in range(index):
+            previous = block[earlier]
+            previous_writes = _writes(previous)
+            if previous_writes is not None and previous_writes in reads:
+                edges.append((earlier, True))  # RAW
+            elif writes is not None and (writes == previous_writes or writes in source_registers(previous)):
+                edges.append((earlier, False))  # WAW ou WAR
+            elif instruction.type in MEMORY_TYPES and previous.type in MEMORY_TYPES and \
+                    (instruction.type in STORE_TYPES or previous.type in STORE_TYPES):
+                edges.append((earlier, False))  # Ordem entre acessos com escrita na memória
+            elif previous.type in CONTROL_TYPES or instruction.type in CONTROL_TYPES:
+                edges.append((earlier, False))  # O desvio continua no fim do bloco
+        predecessors.append(edges)
+    return predecessors
+
+
+def schedule_block(block: List[Instruction], stations: Dict[str, int]) -> List[Instruction]:
+    """Escalonamento de lista com uma emissão por ciclo.
+
+    A prioridade é a altura (latência acumulada até o fim do bloco). A cada
+    ciclo emite a instrução pronta mais prioritária que tem estação livre na
+    sua classe; a estação fica ocupada por latência + 1 ciclos, como no
+    processador. Sem instrução pronta, emite a que ficará pronta antes.
+    """
+    predecessors = _dependences(block)
+    successors: List[List[int]] = [[] for _ in block]
+    for index, edges in enumerate(predecessors):
+        for earlier, _ in edges:
+            successors[earlier].append(index)
+    height = [0] * len(block)
+    for index in reversed(range(len(block))):
+        below = max((height[later] for later in successors[index]), default=0)
+        height[index] = block[index].latency + 1 + below
+
+    issued_at: Dict[int, int] = {}
+    busy_until: Dict[str, List[int]] = {}  # Classe -> ciclos em que cada estação fica livre
+    order = []
+    cycle = 0
+    while len(order) < len(block):
+        best = None
+        for index in range(len(block)):
+            if index in issued_at or any(earlier not in issued_at for earlier, _ in predecessors[index]):
+                continue
+            ready = cycle
+            for earlier, waits in predecessors[index]:
+                ready = max(ready, issued_at[earlier] + (block[earlier].latency + 1 if waits else 1))
+            station_class = STATION_CLASS.get(block[index].type)
+            if station_class is not None:
+                free_at = busy_until.setdefault(station_class, [0] * max(stations.get(station_class, 1), 1))
+                ready = max(ready, min(free_at))
+            key = (ready, -height[index], index)
+            if best is None or key < best[0]:
+                best = (key, index, station_class)
+        (start, _, _), index, station_class = best
+        issued_at[index] = start
+        if station_class is not None:
+            free_at = busy_until[station_class]
+            free_at[free_at.index(min(free_at))] = start + block[index].latency + 1
+        order.append(index)
+        cycle = start + 1
+    return [block[index] for index in order]
+
+
+def schedule(instructions: List[Instruction], n_add: int = 3, n_mul: int = 3, n_mem: int = 2,
+             n_fp_add: int = 2, n_fp_mul: int = 2, n_vector: int = 1,
+             rename: bool = False) -> ScheduleResult:
+    """Reordena cada bloco básico para as latências e estações configuradas.
+
+    Os blocos mantêm tamanho e posição e os desvios continuam no fim de
+    seus blocos, então os deslocamentos dos desvios não mudam. O estado
+    arquitetural final é o mesmo, exceto nos registradores livres usados
+    pela renomeação.
+    """
+    stations = {"add": n_add, "mul": n_mul, "mem": n_mem, "fp_add": n_fp_add, "fp_mul": n_fp_mul,
+                "vector": n_vector}
+    # Cópias: a lista original (e a fusão marcada nela) não é alterada
+    instructions = [replace(instruction, fused=None) for instruction in instructions]
+    free = _free_registers(instructions) if rename else {}
+    result = ScheduleResult(instructions=[])
+    for start, end in basic_blocks(instructions):
+        block = instructions[start:end]
+        if rename:
+            block, renamed = rename_block(block, free)
+            result.renamed += renamed
+        scheduled = schedule_block(block, stations)
+        # Compara pela identidade: a renomeação cria objetos novos, mas mantém a ordem
+        positions = {id(instruction): position for position, instruction in enumerate(block)}
+        result.moved += sum(1 for position, instruction in enumerate(scheduled)
+                            if positions[id(instruction)] != position)
+        result.instructions.extend(scheduled)
+        result.blocks += 1
+    return result
@@ -0,0 +1,195 @@
+# service.py
+
+import asyncio
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+from .api import SimulationConfig, parse_program, simulate
+
+# Códigos de erro do JSON-RPC 2.0
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+SIMULATION_ERROR = -32000
+
+
+def run_simulation(job: Dict) -> Dict:
+    """Executa uma simulação completa em um processo do pool"""
+    config = SimulationConfig.from_dict(job.get("config", {}))
+    return simulate(job["program"], config).as_dict()
+
+
+def _warm_up():
+    """Inicializador dos workers: carrega os módulos e aquece o interpretador"""
+    run_simulation({"program": ["ADD R1, R2, R3"], "config": {"max_cycles": 16}})
+
+
+def _job_key(job: Dict) -> str:
+    return json.dumps(job, sort_keys=True)
+
+
+class SimulationService:
+    """Servidor JSON-RPC local (socket Unix) que distribui simulações para um
+    pool persistente de processos.
+
+    Cada requisição é uma linha JSON. Métodos:
+      - simulate {program, config}: resultado de uma simulação
+      - sweep {program, configs}: uma notificação "progress" por configuração
+        concluída e, ao final, a lista de resultados na ordem das configurações
+    Requisições idênticas em andamento compartilham a mesma simulação.
+    """
+
+    def __init__(self, socket_path: str, workers: Optional[int] = None):
+        self.socket_path = socket_path
+        self.workers = workers or os.cpu_count() or 1
+        self.pool: Optional[ProcessPoolExecutor] = None
+        self.server: Optional[asyncio.AbstractServer] = None
+        self.in_flight: Dict[str, asyncio.Future] = {}
+        self.stats = {
+            "requests": 0,
+            "simulations": 0,
+            "deduplicated": 0
+        }
+
+    async def start(self):
+        """Cria o pool, aquece os workers e passa a aceitar conexões"""
+        self.pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_warm_up)
+        loop = asyncio.get_running_loop()
+        # Força a criação de todos os processos antes da primeira requisição
+        await asyncio.gather(*[
+            loop.run_in_executor(self.pool, run_simulation, {"program": [], "config": {}})
+            for _ in range(self.workers)
+        ])
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        self.server = await asyncio.start_unix_server(self._handle_connection, path=self.socket_path)
+
+    async def serve_forever(self):
+        await self.start()
+        try:
+            async with self.server:
+                await self.server.serve_forever()
+        finally:
+            await self.close()
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+            self.pool = None
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+    def submit(self, job: Dict) -> asyncio.Future:
+        """Agenda uma simulação, reaproveitando uma idêntica já em andamento"""
+        key = _job_key(job)
+        future = self.in_flight.get(key)
+        if future is not None:
+            self.stats["deduplicated"] += 1
+            return future
+
+        loop = asyncio.get_running_loop()
+        future = asyncio.ensure_future(loop.run_in_executor(self.pool, run_simulation, job))
+        self.in_flight[key] = future
+        self.stats["simulations"] += 1
+        future.add_done_callback(lambda _: self.in_flight.pop(key, None))
+        return future
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        lock = asyncio.Lock()
+
+        async def send(message: Dict):
+            async with lock:
+                writer.write(json.dumps(message).encode() + b"\n")
+                await writer.drain()
+
+        tasks = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                # Cada requisição é tratada em paralelo para não bloquear a conexão
+                task = asyncio.create_task(self._handle_request(line, send))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            writer.close()
+
+    async def _handle_request(self, line: bytes, send):
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError as e:
+            await send(_error(None, PARSE_ERROR, f"JSON inválido: {e}"))
+            return
+        if not isinstance(request, dict) or "method" not in request:
+            await send(_error(None, INVALID_REQUEST, "Requisição inválida"))
+            return
+
+        self.stats["requests"] += 1
+        request_id = request.get("id")
+        params = request.get("params") or {}
+        method = request["method"]
+        try:
+            if method == "simulate":
+                result = await self._simulate(params)
+            elif method == "sweep":
+                result = await self._sweep(request_id, params, send)
+            elif method == "stats":
+                result = {**self.stats, "in_flight": len(self.in_flight), "workers": self.workers}
+            else:
+                await send(_error(request_id, METHOD_NOT_FOUND, f"Método desconhecido: {method}"))
+                return
+        except (KeyError, TypeError, ValueError) as e:
+            await send(_error(request_id, INVALID_PARAMS, f"Parâmetros inválidos: {e}"))
+            return
+        except Exception as e:
+            await send(_error(request_id, SIMULATION_ERROR, f"Erro na simulação: {e}"))
+            return
+        await send({"jsonrpc": "2.0", "id": request_id, "result": result})
+
+    async def _simulate(self, params: Dict) -> Dict:
+        job = {"program": parse_program(params["program"]), "config": params.get("config", {})}
+        return await self.submit(job)
+
+    async def _sweep(self, request_id, params: Dict, send) -> List[Dict]:
+        program = parse_program(params["program"])
+        configs = params["configs"]
+        futures = [self.submit({"program": program, "config": config}) for config in configs]
+
+        async def indexed(index: int, future: asyncio.Future):
+            return index, await future
+
+        done = 0
+        for completed in asyncio.as_completed([indexed(i, f) for i, f in enumerate(futures)]):
+            index, result = await completed
+            done += 1
+            await send({
+                "jsonrpc": "2.0",
+                "method": "progress",
+                "params": {"id": request_id, "done": done, "total": len(configs), "index": index, "result": result}
+            })
+        return [future.result() for future in futures]
+
+
+def _error(request_id, code: int, message: str) -> Dict:
+    return {"jsonrpc": "2.0", "id": request_id, "error": {"code": code, "message": message}}
+
+
+def serve(socket_path: str, workers: Optional[int] = None):
+    """Inicia o serviço e bloqueia até ser interrompido"""
+    service = SimulationService(socket_path, workers=workers)
+    try:
+        asyncio.run(service.serve_forever())
+    except KeyboardInterrupt:
+        pass
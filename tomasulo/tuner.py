@@ -0,0 +1,332 @@
+# tuner.py
+
+import itertools
+import math
+import random
+from dataclasses import dataclass, field, replace
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple, Union
+from .analysis import STATION_CLASS, DataflowBound
+from .api import SimulationConfig, parse_program
+
+# Custo de uma unidade de cada recurso (estação, entrada do ROB, unidade ou lane)
+DEFAULT_COSTS = {
+    "n_add": 1.0,
+    "n_mul": 2.0,
+    "n_mem": 1.5,
+    "n_fp_add": 1.5,
+    "n_fp_mul": 3.0,
+    "n_vector": 4.0,
+    "vector_lanes": 1.0,
+    "rob_size": 0.25,
+}
+
+# Valores considerados para cada recurso, em ordem crescente
+DEFAULT_SPACE = {
+    "n_add": (1, 2, 3, 4),
+    "n_mul": (1, 2, 3, 4),
+    "n_mem": (1, 2, 3, 4),
+    "n_fp_add": (1, 2, 3),
+    "n_fp_mul": (1, 2, 3),
+    "rob_size": (4, 8, 16, 32, 64),
+}
+
+# Classe de estação (analysis.STATION_CLASS) -> parâmetro que define quantas existem
+STATION_RESOURCE = {
+    "add": "n_add",
+    "mul": "n_mul",
+    "mem": "n_mem",
+    "fp_add": "n_fp_add",
+    "fp_mul": "n_fp_mul",
+    "vector": "n_vector",
+}
+
+STRATEGIES = ("halving", "greedy")
+
+
+@dataclass
+class TuningResult:
+    """Configuração escolhida pelo ajuste e o custo da busca"""
+    config: SimulationConfig
+    cost: float
+    ipc: float
+    meets_target: bool
+    strategy: str
+    simulations: int = 0  # Simulações executadas (cada carga de trabalho conta uma)
+    simulated_cycles: int = 0
+    pruned: int = 0  # Configurações descartadas pelo limite de fluxo de dados
+    history: List[Tuple[Dict[str, int], float, float]] = field(default_factory=list)  # (recursos, custo, IPC)
+
+    def as_dict(self) -> Dict:
+        return {
+            "config": {name: getattr(self.config, name) for name in DEFAULT_COSTS},
+            "cost": self.cost,
+            "ipc": self.ipc,
+            "meets_target": self.meets_target,
+            "strategy": self.strategy,
+            "simulations": self.simulations,
+            "simulated_cycles": self.simulated_cycles,
+            "pruned": self.pruned
+        }
+
+
+class ConfigTuner:
+    """Procura a configuração mais barata que atinge o IPC alvo.
+
+    O IPC de um conjunto de cargas de trabalho é o agregado (instruções
+    commitadas / ciclos, somados sobre as cargas). Duas estratégias:
+
+    - "halving" (successive halving): sorteia `candidates` pontos do espaço,
+      simula todos por poucos ciclos e promove a fração 1/`eta` mais
+      promissora para simulações `eta` vezes mais longas, até a simulação
+      completa dos finalistas.
+    - "greedy": parte da menor configuração e, a cada passo, aumenta o
+      recurso que é gargalo (o que mais parou a emissão), preferindo o de
+      maior ganho de IPC por unidade de custo, até atingir o alvo.
+
+    Antes de simular, configurações cujo limite de fluxo de dados já não
+    alcança o alvo são descartadas (DataflowBound.can_beat).
+    """
+
+    def __init__(self, workloads: Sequence[Union[str, Sequence[str]]], target_ipc: float,
+                 costs: Optional[Mapping[str, float]] = None,
+                 space: Optional[Mapping[str, Sequence[int]]] = None,
+                 base: SimulationConfig = SimulationConfig()):
+        if target_ipc <= 0:
+            raise ValueError("O IPC alvo deve ser positivo")
+        self.workloads = [parse_program(program) for program in workloads]
+        if not any(self.workloads):
+            raise ValueError("Nenhuma carga de trabalho com instruções")
+        self.target_ipc = target_ipc
+        self.costs = {**DEFAULT_COSTS, **(costs or {})}
+        self.space = {name: tuple(sorted(values)) for name, values in (space or DEFAULT_SPACE).items()}
+        unknown = (set(self.costs) | set(self.space)) - set(DEFAULT_COSTS)
+        if unknown:
+            raise ValueError(f"Recursos desconhecidos: {sorted(unknown)}")
+        self.base = base
+        self.reset()
+
+    def reset(self):
+        self._results: Dict[Tuple[SimulationConfig, int], float] = {}  # (config, ciclos) -> IPC
+        self._feasible: Dict[SimulationConfig, bool] = {}
+        self._stalls: Dict[SimulationConfig, Dict[str, int]] = {}
+        self.simulations = 0
+        self.simulated_cycles = 0
+        self.pruned = 0
+        self.history: List[Tuple[Dict[str, int], float, float]] = []
+
+    def config_for(self, resources: Mapping[str, int]) -> SimulationConfig:
+        return replace(self.base, **resources)
+
+    def cost(self, config: SimulationConfig) -> float:
+        return sum(weight * getattr(config, name) for name, weight in self.costs.items())
+
+    def _bounds(self, config: SimulationConfig) -> List[DataflowBound]:
+        bounds = []
+        for program in self.workloads:
+            processor = config.build_processor()
+            processor.load_program(program)
+            bounds.append(processor.dataflow_bound)
+        return bounds
+
+    def can_meet_target(self, config: SimulationConfig) -> bool:
+        """False quando o limite de fluxo de dados garante que o alvo não é atingido"""
+        feasible = self._feasible.get(config)
+        if feasible is None:
+            bounds = self._bounds(config)
+            total = DataflowBound(
+                instructions=sum(bound.instructions for bound in bounds),
+                critical_path_cycles=sum(bound.lower_bound_cycles for bound in bounds),
+                has_branches=any(bound.has_branches for bound in bounds)
+            )
+            # Atingir o alvo exige no máximo floor(instruções / alvo) ciclos
+            feasible = total.can_beat(math.floor(total.instructions / self.target_ipc) + 1)
+            self._feasible[config] = feasible
+            if not feasible:
+                self.pruned += 1
+        return feasible
+
+    def _run(self, config: SimulationConfig, max_cycles: int) -> Tuple[int, int, Dict[str, int], bool]:
+        """Simula as cargas e conta, por recurso, os ciclos em que a emissão parou por falta dele.
+
+        Também indica se todas as cargas terminaram dentro de `max_cycles`.
+        """
+        committed = cycles = 0
+        stalls: Dict[str, int] = {}
+        finished = True
+        for program in self.workloads:
+            processor = config.build_processor()
+            processor.load_program(program)
+            while processor.cycle < max_cycles and processor.step():
+                reason = processor.stall_reason
+                if reason == "rob_full":
+                    resource = "rob_size"
+                elif reason == "no_station":
+                    # Tipos sem classe de estação (BNE, J) não dependem de nenhum recurso ajustável
+                    station_class = STATION_CLASS.get(processor.instructions[processor.current_instruction].type)
+                    if station_class is None:
+                        continue
+                    resource = STATION_RESOURCE[station_class]
+                else:
+                    continue
+                stalls[resource] = stalls.get(resource, 0) + 1
+            committed += processor.metrics["committed_instructions"]
+            cycles += processor.cycle
+            finished = finished and processor.is_finished
+            self.simulations += 1
+            self.simulated_cycles += processor.cycle
+        return committed, cycles, stalls, finished
+
+    def evaluate(self, config: SimulationConfig, max_cycles: Optional[int] = None) -> float:
+        """IPC agregado das cargas, simulando no máximo `max_cycles` ciclos cada"""
+        max_cycles = min(max_cycles or self.base.max_cycles, self.base.max_cycles)
+        key = (config, max_cycles)
+        if self.complete(config):
+            return self._results[(config, self.base.max_cycles)]
+        if key not in self._results:
+            committed, cycles, stalls, finished = self._run(config, max_cycles)
+            ipc = committed / cycles if cycles else 0
+            self._results[key] = ipc
+            # Cargas que terminaram antes do limite já dão o resultado completo
+            if finished or max_cycles == self.base.max_cycles:
+                self._results[(config, self.base.max_cycles)] = ipc
+                self._stalls[config] = stalls
+                self.history.append(({name: getattr(config, name) for name in self.space},
+                                     self.cost(config), ipc))
+        return self._results[key]
+
+    def complete(self, config: SimulationConfig) -> bool:
+        """Se o IPC da simulação completa da configuração já é conhecido"""
+        return (config, self.base.max_cycles) in self._results
+
+    def stalls(self, config: SimulationConfig) -> Dict[str, int]:
+        """Ciclos de emissão parada por recurso na simulação completa"""
+        self.evaluate(config)
+        return self._stalls[config]
+
+    def _rank(self, config: SimulationConfig, ipc: float, tolerance: float = 0) -> Tuple:
+        """Ordem de promoção: as que atingem o alvo na simulação completa pelo
+        custo, depois as que o atingem (com tolerância) em uma simulação
+        truncada, também pelo custo, e por fim as demais pelo IPC"""
+        if self.complete(config):
+            if ipc >= self.target_ipc:
+                return (0, self.cost(config), -ipc)
+        elif ipc >= self.target_ipc * (1 - tolerance):
+            return (1, self.cost(config), -ipc)
+        return (2, -ipc, self.cost(config))
+
+    def _result(self, config: SimulationConfig, strategy: str) -> TuningResult:
+        ipc = self.evaluate(config)
+        return TuningResult(
+            config=config,
+            cost=self.cost(config),
+            ipc=ipc,
+            meets_target=ipc >= self.target_ipc,
+            strategy=strategy,
+            simulations=self.simulations,
+            simulated_cycles=self.simulated_cycles,
+            pruned=self.pruned,
+            history=list(self.history)
+        )
+
+    def _smallest(self) -> SimulationConfig:
+        return self.config_for({name: values[0] for name, values in self.space.items()})
+
+    def _largest(self) -> SimulationConfig:
+        return self.config_for({name: values[-1] for name, values in self.space.items()})
+
+    def successive_halving(self, candidates: int = 64, eta: int = 3, min_cycles: int = 256,
+                           tolerance: float = 0.1, seed: int = 0) -> TuningResult:
+        """Successive halving sobre uma amostra do espaço.
+
+        Simulações curtas subestimam o IPC (o pipeline ainda está enchendo),
+        então nas rodadas intermediárias uma configuração conta como dentro
+        do alvo com IPC >= alvo * (1 - tolerance).
+        """
+        if eta < 2:
+            raise ValueError("eta deve ser pelo menos 2")
+        names = list(self.space)
+        grid = list(itertools.product(*(self.space[name] for name in names)))
+        if len(grid) > candidates:
+            grid = random.Random(seed).sample(grid, candidates)
+        configs = [self.config_for(dict(zip(names, values))) for values in grid]
+        # A menor é a resposta mais barata possível; a maior, a de maior IPC
+        largest = self._largest()
+        for extreme in (self._smallest(), largest):
+            if extreme not in configs:
+                configs.append(extreme)
+        survivors = [config for config in configs if self.can_meet_target(config)]
+        if not survivors:
+            # Nenhuma pode atingir o alvo: a maior é a melhor resposta possível
+            return self._result(largest, "halving")
+
+        budget = min_cycles
+        met: Optional[SimulationConfig] = None  # A mais barata que atingiu o alvo na simulação completa
+        while len(survivors) > 1 and budget < self.base.max_cycles:
+            ranked = sorted(survivors, key=lambda config: self._rank(config, self.evaluate(config, budget), tolerance))
+            if self._rank(ranked[0], self.evaluate(ranked[0], budget))[0] == 0:
+                if met is None or self.cost(ranked[0]) < self.cost(met):
+                    met = ranked[0]
+            survivors = ranked[:max(1, math.ceil(len(survivors) / eta))]
+            budget *= eta
+
+        # A maior configuração é a reserva caso as finalistas não atinjam o alvo
+        finalists = survivors + [largest] + ([met] if met is not None else [])
+        best = min(finalists, key=lambda config: self._rank(config, self.evaluate(config)))
+        if self._rank(best, self.evaluate(best))[0] != 0:
+            best = largest
+        return self._result(best, "halving")
+
+    def greedy(self) -> TuningResult:
+        """Busca gulosa guiada pelo gargalo.
+
+        A cada passo são testados os aumentos dos recursos que pararam a
+        emissão (todos, se nenhum parou) e fica o de maior ganho de IPC por
+        custo. Sem ganho, aumenta o recurso que mais parou a emissão, pois
+        gargalos simultâneos só melhoram o IPC quando ambos crescem.
+        """
+        largest = self._largest()
+        if not self.can_meet_target(largest):
+            # Nem a maior configuração alcança o alvo: é a melhor resposta possível
+            return self._result(largest, "greedy")
+        current = {name: values[0] for name, values in self.space.items()}
+        config = self.config_for(current)
+        ipc = self.evaluate(config)
+        while ipc < self.target_ipc:
+            stalls = self.stalls(config)
+            steps = {}
+            for name, values in self.space.items():
+                position = values.index(current[name])
+                if position + 1 < len(values):
+                    steps[name] = values[position + 1]
+            if not steps:
+                break
+            ranked = sorted(steps, key=lambda name: -stalls.get(name, 0))
+            tried = [name for name in ranked if stalls.get(name, 0) > 0] or ranked
+
+            best_step, best_score = ranked[0], 0.0
+            for name in tried:
+                neighbor = self.config_for({**current, name: steps[name]})
+                gain = self.evaluate(neighbor) - ipc
+                extra_cost = self.cost(neighbor) - self.cost(config)
+                # Ganho de IPC por unidade de custo adicionada
+                score = gain / extra_cost if extra_cost > 0 else math.inf
+                if gain > 0 and score > best_score:
+                    best_step, best_score = name, score
+            current[best_step] = steps[best_step]
+            config = self.config_for(current)
+            ipc = self.evaluate(config)
+        return self._result(config, "greedy")
+
+    def tune(self, strategy: str = "halving", **options) -> TuningResult:
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Estratégia desconhecida: {strategy}")
+        if strategy == "halving":
+            return self.successive_halving(**options)
+        return self.greedy(**options)
+
+
+def tune(workloads: Sequence[Union[str, Sequence[str]]], target_ipc: float,
+         costs: Optional[Mapping[str, float]] = None, space: Optional[Mapping[str, Sequence[int]]] = None,
+         base: SimulationConfig = SimulationConfig(), strategy: str = "halving", **options) -> TuningResult:
+    """Configuração mais barata que atinge `target_ipc` nas cargas de trabalho"""
+    return ConfigTuner(workloads, target_ipc, costs, space, base).tune(strategy, **options)
@@ -0,0 +1,75 @@
+# vector.py
+
+from typing import Dict
+import numpy as np
+
+MAX_VECTOR_LENGTH = 64  # Elementos por registrador vetorial
+ELEMENT_SIZE = 4  # Distância em bytes entre elementos consecutivos na memória
+VECTOR_REGISTERS = [f"V{i}" for i in range(8)]
+
+
+def empty_vector() -> np.ndarray:
+    return np.zeros(0, dtype=np.int64)
+
+
+def clamp_length(value) -> int:
+    """Valor escrito por SETVL, limitado a [0, MAX_VECTOR_LENGTH]"""
+    try:
+        length = int(value or 0)
+    except (ValueError, OverflowError):  # NaN ou infinito
+        length = 0
+    return max(0, min(length, MAX_VECTOR_LENGTH))
+
+
+def occupancy(latency: int, length: int, lanes: int) -> int:
+    """Ciclos de execução de uma instrução vetorial.
+
+    O primeiro grupo de elementos leva a latência da operação; cada um dos
+    demais ceil(VL / lanes) - 1 grupos sai um ciclo depois. Nunca é menor
+    que a latência, o que mantém o limite de analysis.py válido.
+    """
+    groups = -(-length // lanes) if length > 0 else 1
+    return latency + max(groups, 1) - 1
+
+
+def fit(vector, length: int) -> np.ndarray:
+    """Os primeiros `length` elementos do vetor, completando com zeros"""
+    vector = np.asarray(vector if vector is not None else empty_vector())
+    if len(vector) >= length:
+        return vector[:length]
+    return np.concatenate([vector, np.zeros(length - len(vector), dtype=vector.dtype)])
+
+
+def load(memory: Dict[int, int], address: int, length: int) -> np.ndarray:
+    """Lê `length` elementos consecutivos a partir de `address`"""
+    end = address + length * ELEMENT_SIZE
+    return np.array([memory.get(element, 0) for element in range(address, end, ELEMENT_SIZE)])
+
+
+def store(memory: Dict[int, int], address: int, vector, length: int):
+    """Escreve os primeiros `length` elementos a partir de `address`.
+
+    Os elementos voltam a ser int/float do Python, como os das escritas escalares.
+    """
+    end = address + length * ELEMENT_SIZE
+    memory.update(zip(range(address, end, ELEMENT_SIZE), fit(vector, length).tolist()))
+
+
+def add(a, b, length: int) -> np.ndarray:
+    return fit(a, length) + fit(b, length)
+
+
+def multiply(a, b, length: int) -> np.ndarray:
+    return fit(a, length) * fit(b, length)
+
+
+def values_equal(a, b) -> bool:
+    """Igualdade de valores de registrador, escalares ou vetores (NaN == NaN)"""
+    if isinstance(a, np.ndarray) or isinstance(b, np.ndarray):
+        a, b = np.asarray(a), np.asarray(b)
+        if a.shape != b.shape:
+            return False
+        return bool(np.array_equal(a, b, equal_nan=a.dtype.kind == "f" or b.dtype.kind == "f"))
+    if isinstance(a, float) and isinstance(b, float) and a != a and b != b:
+        return True
+    return a == b